@@ -1,231 +1,266 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, request, jsonify
 from flask_cors import CORS
-import random, string, requests, os
-from leaderboard import leaderboard_bp, init_db
+import logging, random, string, os, threading, time
+from leaderboard import leaderboard_bp, init_db, start_score_flusher, SCORE_QUEUE
+from game_session import parse_letters
+from game_state import GameState
+from game_store import make_game_store
+from llm_client import LLMClient, LLMUnavailable
+from metrics import REGISTRY, REQUEST_SECONDS, WORDS_SERVED, LLM_SECONDS, LLM_WORDS, Gauge
+from word_bank import get_word_bank
+from word_batch import BatchWordParser, batch_token_budget, build_batch_prompt
+from word_pool import WordPool
+from word_store import WordStore
+from word_refill import WordRefiller
+
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+log = logging.getLogger(__name__)
 
 # Load environment variables
 try:
     from dotenv import load_dotenv
     load_dotenv()
 except ImportError:
-    print("python-dotenv not installed. Install with: pip install python-dotenv")
+    log.warning("python-dotenv not installed. Install with: pip install python-dotenv")
+
+# App settings; WORDGUESS_* environment variables override these (WORDGUESS_DB_PATH -> DB_PATH)
+DEFAULT_CONFIG = {
+    "CORS_ORIGINS": ["http://localhost:5173", "http://127.0.0.1:5173"],  # list or comma-separated string
+    "SCHEMA_SETUP": "auto",  # "skip" when the release step runs `flask --app app leaderboard init-db`
+    "PRELOAD": False,        # load shared data up front for a server that forks workers after import
+}
+
+game_bp = Blueprint("game", __name__)
+
+# Game state storage (level and topic live in each game record)
+GAMES = make_game_store(encode=GameState.dumps, decode=GameState.loads)
+
+# Word pool tuning: refill a bucket once it drops below the low-water mark,
+# and warm up levels 1..N for every topic when a worker starts serving
+WORD_POOL_LOW_WATER = int(os.getenv("WORD_POOL_LOW_WATER", 2))
+WORD_POOL_BATCH = int(os.getenv("WORD_POOL_BATCH", 5))
+WORD_REFILL_MAX_BUCKETS = int(os.getenv("WORD_REFILL_MAX_BUCKETS", 8))
+WORD_WARMUP_LEVELS = int(os.getenv("WORD_WARMUP_LEVELS", 3))
+WORD_POOL_CAPACITY = int(os.getenv("WORD_POOL_CAPACITY", 20))
+WORD_STORE_REUSE_MIN = int(os.getenv("WORD_STORE_REUSE_MIN", 30))
+
+# Word difficulty per level: a rank within the level's (topic, length) bucket,
+# 0 = easiest word, rising by a step per level
+DIFFICULTY_START = float(os.getenv("DIFFICULTY_START", 0.2))
+DIFFICULTY_STEP = float(os.getenv("DIFFICULTY_STEP", 0.1))
+
+# Pool of pre-generated words to reduce AI calls
+WORD_POOL = WordPool(capacity=WORD_POOL_CAPACITY)
+
+# AI words persisted in wordguess.db, reused once a bucket is well stocked (bound in create_app)
+WORD_STORE = WordStore(reuse_min=WORD_STORE_REUSE_MIN)
+
+# Shared AI client (pooled connections, concurrency limit, circuit breaker);
+# its HTTP stack is loaded with the first call
+LLM = LLMClient.from_env()
+
+_workers_pid = None  # process whose background threads are running
+_workers_lock = threading.Lock()
 
-app = Flask(__name__)
-CORS(app, origins=["http://localhost:5173", "http://127.0.0.1:5173"])
+def create_app(config=None):
+    """Build the Flask app: DEFAULT_CONFIG, then WORDGUESS_* environment variables, then config.
+    The word bank, the AI client and background threads are set up on first use, not here."""
+    app = Flask(__name__)
+    app.config.update(DEFAULT_CONFIG)
+    app.config.from_prefixed_env("WORDGUESS")
+    app.config.update(config or {})
+    
+    origins = app.config["CORS_ORIGINS"]
+    if isinstance(origins, str):
+        origins = [origin.strip() for origin in origins.split(",") if origin.strip()]
+    CORS(app, origins=origins, expose_headers=["X-Next-Cursor"])
+    
+    # Initialize database and register blueprints
+    init_db(app)
+    WORD_STORE.init_app(app)
+    app.register_blueprint(leaderboard_bp)
+    app.register_blueprint(game_bp)
+    app.extensions["game_store"] = GAMES  # used by /api/score to score finished games
+    
+    if app.config["PRELOAD"]:
+        preload()
+    return app
 
-# Initialize database and register leaderboard blueprint
-init_db(app)
-app.register_blueprint(leaderboard_bp)
+def preload():
+    """Load what forked workers can share before the server forks: the word bank and
+    the AI client's HTTP stack. Threads and connections wait for each worker's first request."""
+    get_word_bank()
+    import requests  # noqa: F401  (imported by the AI client on its first call)
 
-# Game state storage
-GAMES = {}
-CURRENT_LEVELS = {}  # Track current level for each game
-GAME_TOPICS = {}     # Track topic for each game
+@game_bp.before_app_request
+def start_workers():
+    """Start this process's background threads: the score flusher and the word pool warm-up.
+    Runs on the first request rather than at import, so it happens again after a fork."""
+    global _workers_pid
+    pid = os.getpid()
+    if _workers_pid == pid:
+        return
+    with _workers_lock:
+        if _workers_pid == pid:
+            return
+        _workers_pid = pid
+    start_score_flusher()
+    REFILLER.warm_up(get_word_bank().topics, [3 + (level - 1) for level in range(1, WORD_WARMUP_LEVELS + 1)])
 
-# Simple word cache to reduce AI calls
-WORD_CACHE = {}
+def update_game(gid, fn):
+    """Apply fn to a stored game as one atomic read-modify-write and return its result,
+    or None if there is no such game. Handlers never get() then put() a game: with
+    several workers a concurrent update (a guess, /api/score marking it submitted) would be lost."""
+    try:
+        return GAMES.update(gid, fn) if gid else None
+    except KeyError:
+        return None
 
-def mask(word, guessed): return " ".join([c if c in guessed else "_" for c in word])
 def new_id(n=8): return "".join(random.choice(string.ascii_letters + string.digits) for _ in range(n))
 
-def generate_ai_word(topic, word_length):
-    """Generate a word using AI with fallback"""
-    # Check cache first
-    cache_key = f"{topic}_{word_length}"
-    if cache_key in WORD_CACHE and len(WORD_CACHE[cache_key]) > 0:
-        cached_words = WORD_CACHE[cache_key]
-        word = cached_words.pop(0)  # Remove from cache to avoid reuse
-        print(f"Using cached word: {word}")
-        return word
+def pregenerate_batch(buckets, count=5):
+    """Pre-generate words for several (topic, length) buckets with one AI call.
+    Buckets with stored AI words are refilled from wordguess.db first; the rest
+    are pooled as they stream in, and buckets left empty get fallback words.
+    Returns {(topic, length): [words added]}"""
+    added = {bucket: [] for bucket in buckets}
     
+    # Reuse persisted AI words where the store has them
     try:
-        api_key = os.getenv('IBM_API_KEY')
-        if not api_key:
-            print("IBM_API_KEY not found in environment variables")
-            return get_fallback_word(topic, word_length)
-        api_url = "https://us-south.ml.cloud.ibm.com/ml/v1/text/generation?version=2024-11-20"
-        
-        prompt = f"""Generate a {word_length}-letter word about {topic}. Examples: {get_examples(topic, word_length)}. Return only the word."""
-
-        response = requests.post(api_url, 
-            headers={
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {api_key}'
-            },
-            json={
-                'model_id': 'ibm/granite-3.3-8b-instruct',
-                'input': prompt,
-                'parameters': {
-                    'max_new_tokens': 5,
-                    'temperature': 0.7,
-                    'top_p': 0.9
-                }
-            },
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            generated_text = data.get('results', [{}])[0].get('generated_text', '').strip()
-            if generated_text and len(generated_text) == word_length and generated_text.isalpha():
-                print(f"AI generated word: {generated_text}")
-                return generated_text.upper()
-        else:
-            print(f"AI API failed: {response.status_code} - {response.text}")
-            
-    except Exception as e:
-        print(f"AI generation failed: {e}")
+        for topic, word_length in buckets:
+            stored = WORD_STORE.reuse(topic, word_length, count * 2)
+            added[(topic, word_length)] += WORD_POOL.extend(topic, word_length, stored)
+    except Exception:
+        log.exception("Word store read failed")
+    ai_buckets = [bucket for bucket, words in added.items() if not words]
     
-    # Fallback to predefined words
-    print(f"Using fallback word for {topic} {word_length}-letter")
-    return get_fallback_word(topic, word_length)
-
-def pregenerate_words(topic, word_length, count=5):
-    """Pre-generate multiple words using AI"""
-    cache_key = f"{topic}_{word_length}"
-    if cache_key not in WORD_CACHE:
-        WORD_CACHE[cache_key] = []
+    generated = {}
+    if ai_buckets:
+        started = time.perf_counter()
+        outcome = "ok"
+        parser = BatchWordParser(ai_buckets)
+        try:
+            prompt = build_batch_prompt(ai_buckets, count, get_word_bank().examples)
+            for chunk in LLM.generate_stream(prompt, max_new_tokens=batch_token_budget(ai_buckets, count)):
+                found = {}
+                for topic, word_length, word in parser.feed(chunk):
+                    found.setdefault((topic, word_length), []).append(word)
+                for (topic, word_length), words in found.items():
+                    generated.setdefault((topic, word_length), []).extend(words)
+                    added[(topic, word_length)] += WORD_POOL.extend(topic, word_length, words)
+            log.info("Pre-generated %d AI words for %d buckets (%d rejected)",
+                     sum(map(len, generated.values())), len(ai_buckets), parser.rejected)
+        except LLMUnavailable as e:
+            outcome = "unavailable"
+            log.info("AI generation skipped: %s", e)
+        except Exception as e:
+            outcome = "error"
+            log.warning("AI generation failed: %s", e)
+        if outcome != "unavailable":
+            LLM_SECONDS.observe(time.perf_counter() - started, outcome)
+        LLM_WORDS.inc("accepted", amount=sum(map(len, generated.values())))
+        LLM_WORDS.inc("rejected", amount=parser.rejected)
     
+    # Persist validated AI words in bulk
     try:
-        api_key = os.getenv('IBM_API_KEY')
-        if not api_key:
-            print("IBM_API_KEY not found in environment variables")
-            return get_fallback_word(topic, word_length)
-        api_url = "https://us-south.ml.cloud.ibm.com/ml/v1/text/generation?version=2024-11-20"
-        
-        prompt = f"""Generate {count} different {word_length}-letter words about {topic}. Examples: {get_examples(topic, word_length)}. Return only the words, one per line."""
-
-        response = requests.post(api_url, 
-            headers={
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {api_key}'
-            },
-            json={
-                'model_id': 'ibm/granite-3.3-8b-instruct',
-                'input': prompt,
-                'parameters': {
-                    'max_new_tokens': 20,
-                    'temperature': 0.7,
-                    'top_p': 0.9
-                }
-            },
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            generated_text = data.get('results', [{}])[0].get('generated_text', '').strip()
-            words = [word.strip().upper() for word in generated_text.split('\n') if word.strip()]
-            valid_words = [word for word in words if len(word) == word_length and word.isalpha()]
-            
-            if valid_words:
-                WORD_CACHE[cache_key].extend(valid_words)
-                print(f"Pre-generated {len(valid_words)} AI words for {topic} {word_length}-letter: {valid_words}")
-                return valid_words[0]
-        else:
-            print(f"AI API failed: {response.status_code} - {response.text}")
-            
-    except Exception as e:
-        print(f"AI generation failed: {e}")
+        WORD_STORE.append(generated)
+    except Exception:
+        log.exception("Word store write failed")
     
     # Fallback to predefined words
-    fallback_words = []
-    for _ in range(count):
-        word = get_fallback_word(topic, word_length)
-        if word not in fallback_words:
-            fallback_words.append(word)
+    for (topic, word_length), words in added.items():
+        if words:
+            continue
+        fallback_words = []
+        for _ in range(count):
+            word = get_fallback_word(topic, word_length)
+            # The bank snaps lengths it lacks to the nearest one; keep those out of this bucket
+            if len(word) == word_length and word not in fallback_words:
+                fallback_words.append(word)
+        words += WORD_POOL.extend(topic, word_length, fallback_words, skip_served=False)
+        log.info("Pre-generated %d fallback words for %s %d-letter", len(words), topic, word_length)
     
-    if fallback_words:
-        WORD_CACHE[cache_key].extend(fallback_words)
-        print(f"Pre-generated {len(fallback_words)} fallback words for {topic} {word_length}-letter: {fallback_words}")
-        return fallback_words[0]
-    
-    return get_fallback_word(topic, word_length)
-
-def get_examples(topic, length):
-    examples = {
-        "animals": {3: "CAT, DOG, BAT, RAT, COW, PIG, FOX, BEE, ANT, OWL", 4: "BEAR, LION, WOLF, DEER, FISH, BIRD, FROG, GOAT, DUCK, SWAN", 5: "TIGER, EAGLE, SHARK, WHALE, PANDA, KOALA, ZEBRA, HORSE, SHEEP, MOUSE"},
-        "food": {3: "PIE, TEA, CAKE, SOUP, BREAD, RICE, MEAT, FISH, MILK, SALT", 4: "PIZZA, PASTA, SALAD, STEAK, CHICKEN, BURGER, SANDWICH, COOKIE", 5: "PIZZA, PASTA, SALAD, STEAK, CHICKEN, BURGER, SANDWICH, COOKIE"},
-        "sports": {3: "RUN, GOLF, TENNIS, SOCCER, HOCKEY, BASKETBALL, FOOTBALL, BASEBALL", 4: "GOLF, TENNIS, SOCCER, HOCKEY, BASKETBALL, FOOTBALL, BASEBALL", 5: "TENNIS, SOCCER, HOCKEY, BASKETBALL, FOOTBALL, BASEBALL"},
-        "technology": {3: "CPU, RAM, USB, WIFI, APP, WEB, CODE, DATA, FILE, LINK", 4: "CODE, DATA, FILE, LINK, BLOG, WIFI, USB, CPU, RAM, APP", 5: "LAPTOP, MOUSE, KEYBOARD, SCREEN, CAMERA, PHONE, TABLET, ROUTER"},
-        "nature": {3: "TREE, FLOWER, GRASS, LEAF, BARK, ROOT, STEM, SEED, BUD, FRUIT", 4: "TREE, FLOWER, GRASS, LEAF, BARK, ROOT, STEM, SEED, BUD, FRUIT", 5: "TREE, FLOWER, GRASS, LEAF, BARK, ROOT, STEM, SEED, BUD, FRUIT"},
-        "space": {3: "SUN, MOON, STAR, PLANET, EARTH, MARS, JUPITER, SATURN, NEPTUNE, URANUS", 4: "SUN, MOON, STAR, PLANET, EARTH, MARS, JUPITER, SATURN, NEPTUNE, URANUS", 5: "SUN, MOON, STAR, PLANET, EARTH, MARS, JUPITER, SATURN, NEPTUNE, URANUS"},
-        "music": {3: "SONG, BEAT, RHYTHM, MELODY, HARMONY, CHORD, NOTE, SCALE, PIANO, GUITAR", 4: "SONG, BEAT, RHYTHM, MELODY, HARMONY, CHORD, NOTE, SCALE, PIANO, GUITAR", 5: "SONG, BEAT, RHYTHM, MELODY, HARMONY, CHORD, NOTE, SCALE, PIANO, GUITAR"},
-        "movies": {3: "FILM, MOVIE, ACTOR, ACTOR, DIRECTOR, PRODUCER, SCREENPLAY, SCRIPT, SCENE, CUT", 4: "FILM, MOVIE, ACTOR, ACTOR, DIRECTOR, PRODUCER, SCREENPLAY, SCRIPT, SCENE, CUT", 5: "FILM, MOVIE, ACTOR, ACTOR, DIRECTOR, PRODUCER, SCREENPLAY, SCRIPT, SCENE, CUT"},
-        "science": {3: "ATOM, CELL, GENE, DNA, MOLECULE, ELEMENT, COMPOUND, REACTION, EXPERIMENT, HYPOTHESIS", 4: "ATOM, CELL, GENE, DNA, MOLECULE, ELEMENT, COMPOUND, REACTION, EXPERIMENT, HYPOTHESIS", 5: "ATOM, CELL, GENE, DNA, MOLECULE, ELEMENT, COMPOUND, REACTION, EXPERIMENT, HYPOTHESIS"},
-        "travel": {3: "TRIP, JOURNEY, VACATION, HOLIDAY, ADVENTURE, EXPLORE, DISCOVER, VISIT, TOUR, SIGHTSEEING", 4: "TRIP, JOURNEY, VACATION, HOLIDAY, ADVENTURE, EXPLORE, DISCOVER, VISIT, TOUR, SIGHTSEEING", 5: "TRIP, JOURNEY, VACATION, HOLIDAY, ADVENTURE, EXPLORE, DISCOVER, VISIT, TOUR, SIGHTSEEING"}
-    }
-    return examples.get(topic, {}).get(length, "WORD, GAME, PLAY, FUN, EASY, HARD, GOOD, BEST")
-
-def get_fallback_word_list(topic, length):
-    """Get list of all fallback words for a topic and length"""
-    fallback_words = {
-        "animals": {
-            3: ["CAT", "DOG", "BAT", "RAT", "COW", "PIG", "FOX", "BEE", "ANT", "OWL"], 
-            4: ["BEAR", "LION", "WOLF", "DEER", "FISH", "BIRD", "FROG", "GOAT", "DUCK", "SWAN"], 
-            5: ["TIGER", "EAGLE", "SHARK", "WHALE", "PANDA", "KOALA", "ZEBRA", "HORSE", "SHEEP", "MOUSE"]
-        },
-        "food": {
-            3: ["PIE", "TEA", "HAM", "JAM", "BUN", "EGG", "OAT", "NUT", "FIG", "YAM"],
-            4: ["MEAT", "FISH", "RICE", "MILK", "SALT", "SOUP", "CAKE", "TACO", "PEAR", "PLUM"],
-            5: ["PIZZA", "PASTA", "SALAD", "STEAK", "BREAD", "APPLE", "LEMON", "MANGO", "PEACH", "MELON"]
-        },
-        "sports": {
-            3: ["RUN", "BOX", "SKI", "ROW", "JOG", "GYM", "WIN", "TIE", "BAT", "NET"],
-            4: ["GOLF", "YOGA", "SURF", "DIVE", "RACE", "JUMP", "SWIM", "KICK", "BALL", "PUNT"],
-            5: ["RUGBY", "JUDO", "BOXEO", "RELAY", "CHESS", "DARTS", "SKATE", "CYCLE", "WRESTL", "FENCE"]
-        },
-        "technology": {
-            3: ["CPU", "RAM", "USB", "APP", "WEB", "NET"],
-            4: ["CODE", "DATA", "FILE", "LINK", "BLOG", "WIFI", "BYTE", "CHIP", "PORT", "DISK"],
-            5: ["MOUSE", "CABLE", "PIXEL", "CLOUD", "EMAIL", "LOGIN", "VIRUS", "PROXY", "CACHE", "LINUX"]
-        },
-        "nature": {
-            3: ["SKY", "SUN", "SEA", "OAK", "DEW", "FOG", "MUD", "BAY", "DAM", "IVY"],
-            4: ["TREE", "LEAF", "ROOT", "SEED", "SOIL", "MOSS", "WEED", "PINE", "FERN", "VINE"],
-            5: ["GRASS", "PLANT", "RIVER", "OCEAN", "MOUNT", "STONE", "CLOUD", "STORM", "FLORA", "FAUNA"]
-        },
-        "space": {
-            3: ["SUN", "ORB", "RAY", "SKY", "UFO", "ION", "GAS", "RED", "DIM", "HOT"],
-            4: ["MOON", "STAR", "MARS", "ORBIT", "VOID", "NOVA", "TAIL", "RING", "DUST", "BEAM"],
-            5: ["EARTH", "VENUS", "PLUTO", "COMET", "ORBIT", "GALAXY", "NEBULA", "QUARK", "BLACK", "SPACE"]
-        },
-        "music": {
-            3: ["RAP", "POP", "HIP", "JAZ", "DUO", "BAR", "KEY", "BOP", "HIT", "JAM"],
-            4: ["SONG", "BEAT", "NOTE", "TUNE", "BASS", "DRUM", "JAZZ", "ROCK", "FUNK", "SOLO"],
-            5: ["PIANO", "OPERA", "CHOIR", "VOCAL", "TRACK", "ALBUM", "TEMPO", "SCALE", "CHORD", "MUSIC"]
-        },
-        "movies": {
-            3: ["ACT", "SET", "CUT", "DVD", "CGI", "VFX", "RUN", "HIT", "BIO", "WAR"],
-            4: ["FILM", "HERO", "PLOT", "ROLE", "CAST", "SHOT", "CLIP", "REEL", "TAKE", "ZOOM"],
-            5: ["ACTOR", "DRAMA", "SCENE", "GENRE", "CAMEO", "TITLE", "FRAME", "AWARD", "DEBUT", "SEQUEL"]
-        },
-        "science": {
-            3: ["DNA", "ION", "LAB", "RAY", "GAS", "ORE", "WAX", "OIL", "AIR", "ICE"],
-            4: ["ATOM", "CELL", "GENE", "TEST", "ACID", "BASE", "SALT", "BOND", "MASS", "VOLT"],
-            5: ["LASER", "ENERGY", "FORCE", "SPEED", "QUANTUM", "PLASMA", "PHOTON", "PROTON", "ELECTRON", "NEUTR"]
-        },
-        "travel": {
-            3: ["JET", "BUS", "CAR", "MAP", "BAG", "VAN", "SKY", "SEA", "BAY", "ZIP"],
-            4: ["TRIP", "TOUR", "VISA", "TAXI", "ROAD", "SHIP", "PORT", "CITY", "ISLE", "LANE"],
-            5: ["TRAIN", "HOTEL", "BEACH", "PLANE", "FERRY", "CRUISE", "FLIGHT", "TICKET", "RESORT", "VOYAGE"]
-        }
-    }
-    
-    topic_words = fallback_words.get(topic, fallback_words["animals"])
-    length_words = topic_words.get(length, topic_words.get(3, ["CAT", "DOG", "BAT"]))
-    return length_words
+    return added
+
+def llm_calls_per_1000_games():
+    """Outbound AI calls per 1,000 words served to games"""
+    served = WORD_POOL.hits + WORD_POOL.misses
+    return LLM.calls * 1000 / served if served else 0.0
+
+def get_fallback_word(topic, length, difficulty=None):
+    """Get a random fallback word for a topic and length, optionally near a target difficulty"""
+    return get_word_bank().sample(topic, length, difficulty)
+
+def target_difficulty(level):
+    """Difficulty rank asked of a level's word"""
+    return min(max(DIFFICULTY_START + DIFFICULTY_STEP * (level - 1), 0.0), 1.0)
+
+def next_word(topic, word_length, level=1):
+    """Pop a ready word in the level's difficulty band for the request path, or take a
+    fallback word on a miss. Never calls the AI API; the refiller tops the bucket up in the background."""
+    difficulty = target_difficulty(level)
+    # Pool buckets and refills exist only for topics and lengths the word bank has
+    bank = get_word_bank()
+    key = bank.resolve(topic, word_length)
+    # A pool bucket holds a handful of words, so the level's band is taken from the bank's scores
+    word = WORD_POOL.pop(*key, bank.score_bounds(*key, difficulty))
+    REFILLER.ensure(*key)
+    if word:
+        WORD_STORE.record_served(*key, word)
+        WORDS_SERVED.inc(*key, "pool")  # labels from the bank, never the request body
+        return word
+    WORDS_SERVED.inc(*key, "fallback")
+    return get_fallback_word(topic, word_length, difficulty)
 
-def get_fallback_word(topic, length):
-    """Get a random fallback word for a topic and length"""
-    words = get_fallback_word_list(topic, length)
-    return random.choice(words)
+REFILLER = WordRefiller(
+    pregenerate_batch,
+    WORD_POOL.size,
+    low_water=WORD_POOL_LOW_WATER,
+    batch_size=WORD_POOL_BATCH,
+    max_batch=WORD_REFILL_MAX_BUCKETS,
+)
 
-@app.get("/api/health")
+# Scrape-time gauges
+REGISTRY.register(Gauge("wordguess_live_games", "Games held by the game store", lambda: len(GAMES)))
+REGISTRY.register(Gauge("wordguess_word_pool_words", "Words ready in the pool", lambda: len(WORD_POOL)))
+REGISTRY.register(Gauge("wordguess_score_queue_depth", "Scores waiting for the flusher", SCORE_QUEUE.depth))
+REGISTRY.register(Gauge("wordguess_llm_calls", "AI calls made by this process", lambda: LLM.calls))
+REGISTRY.register(Gauge("wordguess_llm_calls_per_1000_games", "AI calls per 1,000 words served to games",
+                        llm_calls_per_1000_games))
+REGISTRY.register(Gauge("wordguess_generation_coalesced", "Refill requests folded into one already pending",
+                        lambda: REFILLER.coalesced))
+
+@game_bp.before_app_request
+def start_timer():
+    request.environ["wordguess.started"] = time.perf_counter()
+
+@game_bp.after_app_request
+def record_latency(response):
+    started = request.environ.get("wordguess.started")
+    if started is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - started,
+                                request.endpoint or "unmatched", request.method, response.status_code)
+    return response
+
+@game_bp.get("/api/metrics")
+def metrics():
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+@game_bp.get("/api/health")
 def health():
-    return {"ok": True}
+    return {
+        "ok": True,
+        "score_queue_depth": SCORE_QUEUE.depth(),
+        "score_queue_dropped": SCORE_QUEUE.dropped,
+        "word_generation": REFILLER.stats(),
+        "llm": {"calls": LLM.calls, "calls_per_1000_games": round(llm_calls_per_1000_games(), 2),
+                "breaker": LLM.breaker.state},
+    }
 
-@app.post("/api/new-game")
+@game_bp.post("/api/new-game")
 def new_game():
     data = request.get_json(silent=True) or {}
     topic = data.get("topic", "animals")
@@ -236,159 +271,150 @@ def new_game():
     # Generate word based on topic and level
     word_length = 3 + (level - 1)  # Level 1 = 3 letters, Level 2 = 4 letters, etc.
     
-    # Try AI generation first, fallback to predefined words
-    # Pre-generate words to reduce AI calls
-    if len(WORD_CACHE.get(f"{topic}_{word_length}", [])) < 2:
-        pregenerate_words(topic, word_length, 5)
-    selected_word = generate_ai_word(topic, word_length)
+    # Take a pre-generated AI word, fallback to predefined words on a miss
+    selected_word = next_word(topic, word_length, level)
     
-    GAMES[gid] = {
-        "word": selected_word, 
-        "guessed": [], 
-        "lives": 6, 
-        "status": "playing",
-        "level": level,
-        "topic": topic
-    }
-    CURRENT_LEVELS[gid] = level
-    GAME_TOPICS[gid] = topic
+    g = GameState(selected_word, level=level, topic=topic)
+    GAMES.put(gid, g)
     
-    g = GAMES[gid]
     return jsonify({
         "game_id": gid, 
-        "masked": mask(g["word"], g["guessed"]), 
-        "lives": g["lives"], 
-        "status": g["status"], 
-        "guessed": g["guessed"],
+        "masked": g.masked_text, 
+        "lives": g.lives, 
+        "status": g.status, 
+        "guessed": g.guessed_list,
         "level": level,
         "topic": topic,
-        "word_length": word_length
+        "word_length": len(selected_word)
     })
 
-@app.post("/api/guess")
+@game_bp.post("/api/guess")
 def guess():
     data = request.get_json(silent=True) or {}
     gid = data.get("game_id"); letter = (data.get("letter") or "").upper()[:1]
-    if not gid or gid not in GAMES: return jsonify({"error": "game_not_found"}), 404
-    if not letter.isalpha(): return jsonify({"error": "invalid_letter"}), 400
-
-    g = GAMES[gid]
-    if g["status"] != "playing":
-        return jsonify({"error": "game_over", "status": g["status"]}), 400
-
-    if letter not in g["guessed"]:
-        g["guessed"].append(letter)
-        if letter not in g["word"]:
-            g["lives"] -= 1
-
-    masked_now = mask(g["word"], g["guessed"])
-
-    # Determine end state
-    if "_" not in masked_now.replace(" ", ""):
-        g["status"] = "won"
-    elif g["lives"] <= 0:
-        g["status"] = "lost"
-
-    # Send the real answer ONLY when the game is over
-    answer = g["word"] if g["status"] in ("won", "lost") else None
-
-    return jsonify({
-        "game_id": gid,
-        "masked": masked_now,
-        "lives": g["lives"],
-        "status": g["status"],
-        "guessed": g["guessed"],
-        "answer": answer,
-        "level": g.get("level", 1),
-        "topic": g.get("topic", "animals")
-    })
+    
+    def apply(g):
+        if not ("A" <= letter <= "Z"):
+            return {"error": "invalid_letter"}, 400
+        if g.status != "playing":
+            return {"error": "game_over", "status": g.status}, 400
+        # Apply the guess; end state is tracked incrementally
+        g.guess(letter)
+        return {
+            "game_id": gid,
+            "masked": g.masked_text,
+            "lives": g.lives,
+            "status": g.status,
+            "guessed": g.guessed_list,
+            "answer": g.answer,  # Real answer ONLY when the game is over
+            "level": g.level,
+            "topic": g.topic
+        }, 200
+    
+    result = update_game(gid, apply)
+    if result is None:
+        return jsonify({"error": "game_not_found"}), 404
+    return jsonify(result[0]), result[1]
 
-@app.post("/api/hint")
-def get_hint():
+@game_bp.post("/api/guess/batch")
+def guess_batch():
+    """Apply several letters in order in one call, with a result per letter"""
     data = request.get_json(silent=True) or {}
     gid = data.get("game_id")
+    letters = parse_letters(data.get("letters"))
+    if letters is None:
+        return jsonify({"error": "invalid_letter"}), 400
     
-    if not gid or gid not in GAMES:
-        return jsonify({"error": "game_not_found"}), 404
-    
-    g = GAMES[gid]
-    word = g["word"]
-    guessed = g["guessed"]
-    
-    # Find unrevealed letters
-    unrevealed_positions = []
-    for i, letter in enumerate(word):
-        if letter not in guessed:
-            unrevealed_positions.append(i)
-    
-    if not unrevealed_positions:
-        return jsonify({"error": "all_letters_revealed"}), 400
-    
-    # Pick a random unrevealed letter
-    import random
-    reveal_index = random.choice(unrevealed_positions)
-    reveal_letter = word[reveal_index]
+    def apply(g):
+        if g.status != "playing":
+            return None
+        results = [
+            {"letter": letter, "result": outcome, "positions": list(positions)}
+            for letter, outcome, positions in g.guess_many(letters)
+        ]
+        return {
+            "game_id": gid,
+            "results": results,
+            "masked": g.masked_text,
+            "lives": g.lives,
+            "status": g.status,
+            "guessed": g.guessed_list,
+            "answer": g.answer,  # Real answer ONLY when the game is over
+            "level": g.level,
+            "topic": g.topic
+        }
     
-    # Add to guessed letters
-    if reveal_letter not in guessed:
-        g["guessed"].append(reveal_letter)
+    # One atomic read-modify-write for the whole batch
+    try:
+        state = GAMES.update(gid, apply) if gid else None
+    except KeyError:
+        state = None
+    if state is None:
+        g = GAMES.get(gid) if gid else None
+        if g is None:
+            return jsonify({"error": "game_not_found"}), 404
+        return jsonify({"error": "game_over", "status": g.status}), 400
+    return jsonify(state)
+
+@game_bp.post("/api/hint")
+def get_hint():
+    data = request.get_json(silent=True) or {}
+    gid = data.get("game_id")
     
-    # Create new masked word
-    new_masked = mask(word, g["guessed"])
+    def apply(g):
+        # Reveal a random unrevealed letter and add it to guessed letters
+        if not g.hints_left:
+            return {"error": "no_hints_left"}, 400
+        hint = g.hint()
+        if hint is None:
+            return {"error": "all_letters_revealed"}, 400
+        reveal_letter, reveal_index = hint
+        return {
+            "game_id": gid,
+            "masked": g.masked_text,
+            "revealed_letter": reveal_letter,
+            "revealed_position": reveal_index,
+            "hints_left": g.hints_left,
+            "guessed": g.guessed_list,
+            "lives": g.lives,
+            "status": g.status
+        }, 200
     
-    return jsonify({
-        "game_id": gid,
-        "masked": new_masked,
-        "revealed_letter": reveal_letter,
-        "revealed_position": reveal_index,
-        "guessed": g["guessed"],
-        "lives": g["lives"],
-        "status": g["status"]
-    })
+    result = update_game(gid, apply)
+    if result is None:
+        return jsonify({"error": "game_not_found"}), 404
+    return jsonify(result[0]), result[1]
 
-@app.post("/api/next-level")
+@game_bp.post("/api/next-level")
 def next_level():
     data = request.get_json(silent=True) or {}
     gid = data.get("game_id")
     
-    if not gid or gid not in GAMES:
-        return jsonify({"error": "game_not_found"}), 404
-    
-    current_level = CURRENT_LEVELS.get(gid, 1)
-    topic = GAME_TOPICS.get(gid, "animals")
-    next_level_num = current_level + 1
-    
-    # Update level tracking
-    CURRENT_LEVELS[gid] = next_level_num
-    
-    # Generate new word for next level
-    word_length = 3 + (next_level_num - 1)
-    
-    # Try AI generation first, fallback to predefined words
-    new_word = generate_ai_word(topic, word_length)
-    
-    # Update game state for next level
-    GAMES[gid] = {
-        "word": new_word,
-        "guessed": [],
-        "lives": 6,
-        "status": "playing",
-        "level": next_level_num,
-        "topic": topic
-    }
+    def advance(g):
+        topic = g.topic
+        next_level_num = g.level + 1
+        
+        # Generate new word for next level
+        word_length = 3 + (next_level_num - 1)
+        
+        # Take a pre-generated AI word, fallback to predefined words on a miss
+        g.start_level(next_word(topic, word_length, next_level_num), next_level_num)
+        return {
+            "game_id": gid,
+            "masked": g.masked_text,
+            "lives": g.lives,
+            "status": g.status,
+            "guessed": g.guessed_list,
+            "level": next_level_num,
+            "topic": topic,
+            "word_length": len(g.word)
+        }
     
-    g = GAMES[gid]
-    return jsonify({
-        "game_id": gid,
-        "masked": mask(g["word"], g["guessed"]),
-        "lives": g["lives"],
-        "status": g["status"],
-        "guessed": g["guessed"],
-        "level": next_level_num,
-        "topic": topic,
-        "word_length": word_length
-    })
+    state = update_game(gid, advance)
+    if state is None:
+        return jsonify({"error": "game_not_found"}), 404
+    return jsonify(state)
 
 if __name__ == "__main__":
-    print("Starting Flask on http://127.0.0.1:5001 …")
-    app.run(host="127.0.0.1", port=5001, debug=True)
+    log.info("Starting Flask on http://127.0.0.1:5001 …")
+    create_app().run(host="127.0.0.1", port=5001, debug=True)
@@ -0,0 +1,72 @@
+"""
+Production entry point for Words Guess Game
+Serves the Flask app under an ASGI server so idle and slow connections are held
+by the event loop instead of a WSGI worker each
+
+    uvicorn asgi:asgi_app --host 0.0.0.0 --port 5001 --workers 2
+
+Handlers run on a bounded thread pool per worker. None of them waits on the AI
+API: words come from the pool and the background refiller makes one call per
+batch of buckets, so a slow or failing provider never holds a request thread.
+With more than one worker, set GAME_STORE=sqlite so every worker sees every game.
+
+The app is built once per process by create_app(). A server that imports it
+and then forks its workers can share the loaded code and word bank:
+
+    WORDGUESS_PRELOAD=1 gunicorn --preload -k uvicorn.workers.UvicornWorker -w 4 asgi:asgi_app
+
+Each forked worker opens its own connections and starts its background threads
+on its first request.
+
+Game sessions: a WebSocket at /api/session/<game_id> carries the game_session
+protocol, one small JSON message per action and a delta back. uvicorn only
+accepts WebSocket upgrades when the websockets package is installed; without
+it the HTTP API is unaffected.
+"""
+
+import asyncio
+import json
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import create_app, GAMES
+import game_session
+
+ASGI_THREADS = int(os.getenv("ASGI_THREADS", 32))           # concurrent handlers per worker
+ASGI_SEND_QUEUE = int(os.getenv("ASGI_SEND_QUEUE", 10))     # response chunks buffered per request
+SESSION_PATH = "/api/session/"
+
+app = create_app()
+http_app = WSGIMiddleware(app, workers=ASGI_THREADS, send_queue_size=ASGI_SEND_QUEUE)
+
+
+async def game_session_socket(scope, receive, send):
+    """One game per connection: a snapshot on open, then a delta per message"""
+    gid = scope["path"][len(SESSION_PATH):]
+    if (await receive())["type"] != "websocket.connect":
+        return
+    # Store calls go to a thread: the SQLite game store does blocking I/O
+    g = await asyncio.to_thread(GAMES.get, gid)
+    if g is None:
+        await send({"type": "websocket.close", "code": 4404})
+        return
+    await send({"type": "websocket.accept"})
+    await send({"type": "websocket.send", "text": json.dumps(game_session.snapshot(gid, g), separators=(",", ":"))})
+    while True:
+        message = await receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        text = message.get("text") or (message.get("bytes") or b"").decode("utf-8", "replace")
+        reply = await asyncio.to_thread(game_session.handle, GAMES, gid, text)
+        await send({"type": "websocket.send", "text": reply})
+
+
+async def asgi_app(scope, receive, send):
+    if scope["type"] == "websocket":
+        if scope["path"].startswith(SESSION_PATH):
+            await game_session_socket(scope, receive, send)
+        else:
+            await send({"type": "websocket.close", "code": 4404})
+        return
+    await http_app(scope, receive, send)
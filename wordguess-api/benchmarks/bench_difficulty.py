@@ -0,0 +1,73 @@
+"""
+Benchmark: word difficulty scoring and band sampling
+
+Scores random words with difficulty.score_words (one NumPy pass per batch) and
+with the same formula written as a per-word Python loop, checks that the two
+agree, then times DifficultyIndex.sample for growing bucket sizes to show a
+draw does not depend on how many words the bucket holds.
+
+Usage: python benchmarks/bench_difficulty.py [--words 100000]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import difficulty  # noqa: E402
+
+FREQUENCY = difficulty.LETTER_FREQUENCY.tolist()
+RANK = difficulty.GUESS_RANK.tolist()
+RARITY = difficulty.RARITY.tolist()
+W = difficulty.WEIGHTS
+
+
+def score_word(word):
+    """Reference: one word at a time in plain Python"""
+    letters = {ord(c) - ord("A") for c in word}
+    wrong = max(RANK[i] + 1 for i in letters) - len(letters)
+    rarity = sum(RARITY[i] for i in letters) / len(letters)
+    return (W["wrong_guesses"] * wrong / (difficulty.ALPHABET - 1)
+            + W["rarity"] * rarity + W["distinct"] * len(letters) / len(word))
+
+
+def random_words(n):
+    return ["".join(random.choices(string.ascii_uppercase, weights=FREQUENCY, k=random.randint(3, 8)))
+            for _ in range(n)]
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    words = random_words(args.words)
+    assert np.allclose(difficulty.score_words(words), [score_word(w) for w in words])
+    vectorized = best_of(lambda: difficulty.score_words(words))
+    loop = best_of(lambda: [score_word(w) for w in words])
+    print(f"scoring {args.words} words: numpy {vectorized * 1000:.1f} ms, python loop {loop * 1000:.1f} ms "
+          f"({loop / vectorized:.1f}x)")
+
+    draws = 10_000
+    for size in (10, 1_000, 100_000):
+        index = difficulty.DifficultyIndex.build({("bench", 5): random_words(size)})
+        elapsed = best_of(lambda: [index.sample(("bench", 5), 0.7) for _ in range(draws)])
+        print(f"sample from {size:>7} words: {elapsed / draws * 1e6:.2f} us per draw")
+
+
+if __name__ == "__main__":
+    main()
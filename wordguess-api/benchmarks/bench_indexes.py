@@ -0,0 +1,126 @@
+"""
+Benchmark: leaderboard and player-history queries before/after the composite indexes
+
+Builds a throwaway SQLite database per table size, times the two hot queries
+with only the original single-column indexes, then adds the composite indexes
+from leaderboard.py and times them again.
+
+Usage: python benchmarks/bench_indexes.py [--sizes 10000,100000,1000000,10000000]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+LEADERBOARD_SQL = "SELECT * FROM scores ORDER BY score DESC, created_at DESC LIMIT 20"
+PLAYER_SQL = "SELECT * FROM scores WHERE player = ? ORDER BY created_at DESC LIMIT 50"
+
+SCHEMA = """
+CREATE TABLE scores (
+    id INTEGER PRIMARY KEY,
+    player VARCHAR(64) NOT NULL,
+    won BOOLEAN NOT NULL,
+    word VARCHAR(64),
+    word_length INTEGER NOT NULL,
+    mistakes INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    accuracy FLOAT NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    created_at DATETIME
+);
+CREATE INDEX ix_scores_player ON scores (player);
+CREATE INDEX ix_scores_score ON scores (score);
+CREATE INDEX ix_scores_created_at ON scores (created_at);
+"""
+
+COMPOSITE = """
+CREATE INDEX ix_scores_player_created_at ON scores (player, created_at DESC);
+CREATE INDEX ix_scores_score_created_at ON scores (score DESC, created_at DESC);
+"""
+
+
+def populate(conn, rows, players):
+    start = datetime(2024, 1, 1)
+    batch = []
+    for i in range(rows):
+        created = start + timedelta(seconds=i * 7 + random.randrange(7))
+        batch.append((
+            f"player{random.randrange(players)}", random.random() < 0.6, "WORD", 4,
+            random.randrange(7), random.randrange(8), random.uniform(0, 100),
+            random.randrange(120_000), random.randrange(1000), created.isoformat(sep=" "),
+        ))
+        if len(batch) == 50_000:
+            conn.executemany("INSERT INTO scores (player, won, word, word_length, mistakes, correct, "
+                             "accuracy, duration_ms, score, created_at) VALUES (?,?,?,?,?,?,?,?,?,?)", batch)
+            batch = []
+    if batch:
+        conn.executemany("INSERT INTO scores (player, won, word, word_length, mistakes, correct, "
+                         "accuracy, duration_ms, score, created_at) VALUES (?,?,?,?,?,?,?,?,?,?)", batch)
+    conn.commit()
+
+
+def time_query(conn, sql, params_fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        params = params_fn()
+        t = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - t) * 1000)
+    return statistics.median(samples)
+
+
+def plan(conn, sql, params):
+    return "; ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+
+def run(rows, repeat):
+    players = max(10, rows // 50)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        conn.executescript(SCHEMA)
+        populate(conn, rows, players)
+        conn.execute("ANALYZE")
+        player = lambda: (f"player{random.randrange(players)}",)
+
+        result = {"rows": rows}
+        for phase in ("before", "after"):
+            if phase == "after":
+                conn.executescript(COMPOSITE)
+                conn.execute("ANALYZE")
+            result[phase] = {
+                "leaderboard_ms": time_query(conn, LEADERBOARD_SQL, tuple, repeat),
+                "player_ms": time_query(conn, PLAYER_SQL, player, repeat),
+                "leaderboard_plan": plan(conn, LEADERBOARD_SQL, ()),
+                "player_plan": plan(conn, PLAYER_SQL, player()),
+            }
+        conn.close()
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="comma-separated row counts (default: 10^4..10^6; add 10000000 for 10^7)")
+    parser.add_argument("--repeat", type=int, default=25, help="timed runs per query (median reported)")
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10} | {'leaderboard before':>18} {'after':>8} | {'player before':>13} {'after':>8}")
+    for rows in (int(n) for n in args.sizes.split(",")):
+        r = run(rows, args.repeat)
+        b, a = r["before"], r["after"]
+        print(f"{rows:>10} | {b['leaderboard_ms']:>15.3f} ms {a['leaderboard_ms']:>5.3f} ms"
+              f" | {b['player_ms']:>10.3f} ms {a['player_ms']:>5.3f} ms")
+        print(f"{'':>10}   plans before: {b['leaderboard_plan']} / {b['player_plan']}")
+        print(f"{'':>10}   plans after:  {a['leaderboard_plan']} / {a['player_plan']}")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: worker startup, cold import to first served request
+
+Each run starts a fresh Python process that imports app.py, builds the app and
+serves one /api/new-game through Flask's test client, timing each phase:
+
+  deploy  first process against a new database (schema setup runs)
+  worker  later processes against the same database (schema already stamped)
+  fork    a preloaded parent (WORDGUESS_PRELOAD=1) forks workers; timed from
+          fork to each worker's first response
+
+"spawn" is the wall time seen from outside, interpreter start-up included.
+No AI calls are made: IBM_API_KEY is unset, so words come from the word bank.
+Works against older trees too, where app.py builds `app` at import.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--forks 4]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, os, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import app as wordguess
+imported = time.perf_counter()
+
+def build():
+    factory = getattr(wordguess, "create_app", None)
+    return factory() if factory else wordguess.app
+
+def first_request(flask_app):
+    response = flask_app.test_client().post("/api/new-game", json={"topic": "animals", "level": 1})
+    assert response.status_code == 200, response.status_code
+
+if sys.argv[2] == "single":
+    flask_app = build()
+    built = time.perf_counter()
+    first_request(flask_app)
+    served = time.perf_counter()
+    print(json.dumps({"import": imported - started, "create_app": built - imported, "first_request": served - built}))
+else:
+    flask_app = build()
+    children = []
+    for _ in range(int(sys.argv[3])):
+        forked = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            first_request(flask_app)
+            print(json.dumps({"fork_to_first_request": time.perf_counter() - forked}), flush=True)
+            os._exit(0)
+        os.waitpid(pid, 0)  # one at a time, so workers do not compete for the CPU
+"""
+
+
+def probe(env, mode, forks=0):
+    """Run the probe in a new interpreter; returns (spawn seconds, [timings per line])"""
+    t = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE, API_DIR, mode, str(forks)],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    spawn = time.perf_counter() - t
+    return spawn, [json.loads(line) for line in out.splitlines() if line.startswith("{")]
+
+
+def ms(values):
+    return round(statistics.median(values) * 1000, 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="processes per scenario")
+    parser.add_argument("--forks", type=int, default=4, help="workers forked from the preloaded parent")
+    args = parser.parse_args(argv)
+
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {k: v for k, v in os.environ.items() if k != "IBM_API_KEY"}
+        env.update({
+            "LOG_LEVEL": "WARNING",
+            "GAME_STORE": "sqlite",
+            "GAME_STORE_PATH": os.path.join(tmp, "games.db"),
+        })
+
+        # A new database per run: every process is the first after a deploy
+        runs = []
+        for i in range(args.runs):
+            spawn, (timings,) = probe(dict(env, WORDGUESS_DB_PATH=os.path.join(tmp, f"deploy{i}.db")), "single")
+            runs.append(dict(timings, spawn=spawn))
+        report["deploy"] = {phase: ms([run[phase] for run in runs]) for phase in runs[0]}
+
+        env["WORDGUESS_DB_PATH"] = os.path.join(tmp, "deploy0.db")
+        runs = []
+        for _ in range(args.runs):
+            spawn, (timings,) = probe(env, "single")
+            runs.append(dict(timings, spawn=spawn))
+        report["worker"] = {phase: ms([run[phase] for run in runs]) for phase in runs[0]}
+
+        _, forks = probe(dict(env, WORDGUESS_PRELOAD="1"), "fork", args.forks)
+        report["fork"] = {"fork_to_first_request": ms([f["fork_to_first_request"] for f in forks])}
+
+    print(f"{'scenario':<8} {'spawn ms':>9} {'import ms':>10} {'create ms':>10} {'first req ms':>13}", file=sys.stderr)
+    for scenario in ("deploy", "worker"):
+        r = report[scenario]
+        print(f"{scenario:<8} {r['spawn']:>9} {r['import']:>10} {r['create_app']:>10} {r['first_request']:>13}",
+              file=sys.stderr)
+    print(f"{'fork':<8} {'':>9} {'':>10} {'':>10} {report['fork']['fork_to_first_request']:>13}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+Load test: simulated players driving the full game loop
+
+Each player starts a game, then for every round guesses letters, takes a hint,
+guesses until the round ends, submits the score, reads the leaderboard and
+moves on to the next level:
+
+    /api/new-game -> /api/guess xN -> /api/hint -> /api/guess ... -> /api/score
+                  -> /api/leaderboard -> /api/next-level -> ...
+
+(The score is submitted before /api/next-level because the next level replaces
+the finished game on the server.)
+
+The IBM endpoint is replaced by a local stub with configurable latency and
+error rate, and every run uses a throwaway database. Two targets:
+
+  --target client  Flask test client in this process; also times SQLite writes
+                   so lock waits show up, and counts games and pooled words
+  --target server  uvicorn (asgi.py) with --workers processes over real HTTP,
+                   games shared through the SQLite game store
+
+Prints a summary table to stderr and a JSON report to stdout (or --output) for
+comparing runs.
+
+Usage: python benchmarks/loadtest.py [--target client|server] [--players 50] [--rounds 3]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LETTER_ORDER = "EAIORTNSLCUDPMHGBFYWKVXZJQ"
+TOPICS = ("animals", "food", "space", "sports", "music")
+SLOW_WRITE_MS = 10  # SQLite writes slower than this are counted as lock waits
+
+
+class StubLLM(BaseHTTPRequestHandler):
+    """Stand-in for the IBM text generation API (plain and SSE streaming)"""
+
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    error_rate = 0.0
+    calls = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).calls += 1
+        time.sleep(self.latency)
+        if random.random() < self.error_rate:
+            self._send(503, b'{"error":"stub failure"}')
+            return
+        text = stub_reply(body.get("input", ""))
+        if "generation_stream" not in self.path:
+            self._send(200, json.dumps({"results": [{"generated_text": text}]}).encode())
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for i in range(0, len(text), 12):
+            event = json.dumps({"results": [{"generated_text": text[i:i + 12]}]})
+            self.wfile.write(f"id: {i}\nevent: message\ndata: {event}\n\n".encode())
+        self.close_connection = True
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def stub_reply(prompt):
+    """Random A-Z words in the shape the batch prompt asks for"""
+    count = int((re.search(r"Generate (\d+) different", prompt) or [0, 5])[1])
+    reply = {}
+    for topic, lengths in re.findall(r"(\w+) \(([\d, ]+) letters\)", prompt):
+        reply[topic] = {
+            n: ["".join(random.choice(LETTER_ORDER) for _ in range(int(n))) for _ in range(count)]
+            for n in lengths.split(", ")
+        }
+    return json.dumps(reply)
+
+
+def start_stub(latency, error_rate):
+    StubLLM.latency, StubLLM.error_rate = latency, error_rate
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLLM)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/ml/v1/text/generation?version=2023-05-29"
+
+
+def percentile(sorted_ms, p):
+    if not sorted_ms:
+        return None
+    return round(sorted_ms[min(len(sorted_ms) - 1, int(len(sorted_ms) * p))], 3)
+
+
+def summarize(samples):
+    """{endpoint: [(status, ms)]} -> per-endpoint counts and latency percentiles"""
+    report = {}
+    for endpoint, rows in sorted(samples.items()):
+        ms = sorted(t for _, t in rows)
+        statuses = {}
+        for status, _ in rows:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        report[endpoint] = {
+            "requests": len(rows),
+            "statuses": statuses,
+            "p50_ms": percentile(ms, 0.50),
+            "p95_ms": percentile(ms, 0.95),
+            "p99_ms": percentile(ms, 0.99),
+            "max_ms": round(ms[-1], 3),
+        }
+    return report
+
+
+def rss_mb(pid="self"):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def tree_rss_mb(pid):
+    """Resident memory of a process and its children (uvicorn workers)"""
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(p) for p in f.read().split()]
+    except OSError:
+        pass
+    sizes = [rss_mb(p) for p in pids]
+    return round(sum(s for s in sizes if s), 1) if any(sizes) else None
+
+
+def play(call, player, rounds, guesses):
+    """One simulated player; call(method, path, payload) -> (status, body)"""
+    status, game = call("POST", "/api/new-game", {"topic": random.choice(TOPICS), "level": 1})
+    if status != 200:
+        return
+    gid = game["game_id"]
+    for _ in range(rounds):
+        state, made, hinted = game, 0, False
+        letters = iter(LETTER_ORDER)
+        while state.get("status") == "playing":
+            if made == guesses and not hinted:
+                hinted = True
+                status, body = call("POST", "/api/hint", {"game_id": gid})
+            else:
+                letter = next((c for c in letters if c not in state.get("guessed", ())), None)
+                if letter is None:
+                    break
+                made += 1
+                status, body = call("POST", "/api/guess", {"game_id": gid, "letter": letter})
+            if status != 200:
+                break
+            state = body
+        call("POST", "/api/score", {"game_id": gid, "player": player})
+        call("GET", "/api/leaderboard?limit=20")
+        status, game = call("POST", "/api/next-level", {"game_id": gid})
+        if status != 200:
+            return
+
+
+def drive(make_call, players, rounds, guesses):
+    """Run all players concurrently; returns ({endpoint: [(status, ms)]}, seconds)"""
+    samples = {}
+    lock = threading.Lock()
+
+    def run(i):
+        local = {}
+        call = make_call()
+
+        def timed(method, path, payload=None):
+            t = time.perf_counter()
+            try:
+                status, body = call(method, path, payload)
+            except Exception:
+                status, body = "error", {}
+            local.setdefault(path.split("?")[0], []).append((status, (time.perf_counter() - t) * 1000))
+            return status, body
+
+        play(timed, f"load{i}", rounds, guesses)
+        with lock:
+            for endpoint, rows in local.items():
+                samples.setdefault(endpoint, []).extend(rows)
+
+    t = time.perf_counter()
+    with ThreadPoolExecutor(players) as pool:
+        list(pool.map(run, range(players)))
+    return samples, time.perf_counter() - t
+
+
+def run_client(args, env):
+    """Drive the app in-process through Flask's test client"""
+    os.environ.update(env)
+    sys.path.insert(0, API_DIR)
+    # Keep anything the app writes to stdout, from any thread, off the report
+    sys.stdout = open(os.devnull, "w")
+    import app as wordguess
+    flask_app = wordguess.create_app()
+    from leaderboard import db, SCORE_QUEUE
+    from sqlalchemy import event
+
+    writes = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["loadtest_t"] = time.perf_counter()
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(("SELECT", "PRAGMA")):
+            writes.append((time.perf_counter() - conn.info.pop("loadtest_t")) * 1000)
+
+    with flask_app.app_context():
+        event.listen(db.engine, "before_cursor_execute", before)
+        event.listen(db.engine, "after_cursor_execute", after)
+
+    before_mem = {"rss_mb": rss_mb(), "games": len(wordguess.GAMES), "pool_words": len(wordguess.WORD_POOL)}
+
+    def make_call():
+        client = flask_app.test_client()
+
+        def call(method, path, payload):
+            response = client.open(path, method=method, json=payload)
+            return response.status_code, response.get_json(silent=True) or {}
+        return call
+
+    samples, elapsed = drive(make_call, args.players, args.rounds, args.guesses)
+    SCORE_QUEUE.flush()
+    after_mem = {"rss_mb": rss_mb(), "games": len(wordguess.GAMES), "pool_words": len(wordguess.WORD_POOL)}
+
+    ms = sorted(writes)
+    sqlite = {
+        "writes": len(ms),
+        "write_p50_ms": percentile(ms, 0.50),
+        "write_p99_ms": percentile(ms, 0.99),
+        "write_max_ms": round(ms[-1], 3) if ms else None,
+        "lock_waits": sum(1 for t in ms if t >= SLOW_WRITE_MS),
+        "lock_wait_ms": round(sum(t for t in ms if t >= SLOW_WRITE_MS), 3),
+    }
+    return samples, elapsed, {"before": before_mem, "after": after_mem}, sqlite
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_server(args, env, tmp):
+    """Drive a multi-worker uvicorn server over HTTP"""
+    port = free_port()
+    env = dict(os.environ, **env, GAME_STORE="sqlite", GAME_STORE_PATH=os.path.join(tmp, "games.db"))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "asgi:asgi_app", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+                conn.request("GET", "/api/health")
+                if conn.getresponse().status == 200:
+                    break
+            except OSError:
+                pass
+            if time.monotonic() > deadline or server.poll() is not None:
+                raise RuntimeError("server did not start")
+            time.sleep(0.2)
+        time.sleep(1)  # let every worker finish importing
+        before_mem = {"rss_mb": tree_rss_mb(server.pid)}
+
+        def make_call():
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+
+            def call(method, path, payload):
+                body = json.dumps(payload).encode() if payload is not None else None
+                conn.request(method, path, body=body, headers={"Content-Type": "application/json"})
+                response = conn.getresponse()
+                data = response.read()
+                return response.status, json.loads(data) if data else {}
+            return call
+
+        samples, elapsed = drive(make_call, args.players, args.rounds, args.guesses)
+        after_mem = {"rss_mb": tree_rss_mb(server.pid)}
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    import sqlite3
+    conn = sqlite3.connect(os.path.join(tmp, "games.db"))
+    after_mem["games"] = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+    conn.close()
+    return samples, elapsed, {"before": before_mem, "after": after_mem}, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("client", "server"), default="client")
+    parser.add_argument("--players", type=int, default=50, help="concurrent simulated players")
+    parser.add_argument("--rounds", type=int, default=3, help="levels played per player")
+    parser.add_argument("--guesses", type=int, default=3, help="guesses before taking the hint")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn workers (server target)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="stub AI response delay in seconds")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="fraction of stub AI calls that fail")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    report_out = sys.stdout
+
+    stub, stub_url = start_stub(args.llm_latency, args.llm_error_rate)
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            "IBM_API_KEY": "loadtest",
+            "IBM_API_URL": stub_url,
+            "WORDGUESS_DB_PATH": os.path.join(tmp, "wordguess.db"),
+            "SCORE_WRITE_BEHIND": os.getenv("SCORE_WRITE_BEHIND", "1"),
+            "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+        }
+        if args.target == "client":
+            samples, elapsed, memory, sqlite = run_client(args, env)
+        else:
+            samples, elapsed, memory, sqlite = run_server(args, env, tmp)
+    stub.shutdown()
+
+    endpoints = summarize(samples)
+    total = sum(e["requests"] for e in endpoints.values())
+    report = {
+        "target": args.target,
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "target")},
+        "elapsed_s": round(elapsed, 3),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 1),
+        "games_per_s": round(args.players * args.rounds / elapsed, 1),
+        "errors": sum(n for e in endpoints.values() for s, n in e["statuses"].items() if s[0] in "5e"),
+        "llm_calls": StubLLM.calls,
+        "endpoints": endpoints,
+        "memory": memory,
+        "sqlite": sqlite,
+    }
+
+    print(f"{args.target}: {total} requests in {elapsed:.2f}s = {report['throughput_rps']} req/s, "
+          f"{report['errors']} errors, {StubLLM.calls} AI calls", file=sys.stderr)
+    print(f"{'endpoint':<20} {'requests':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}", file=sys.stderr)
+    for endpoint, e in endpoints.items():
+        print(f"{endpoint:<20} {e['requests']:>8} {e['p50_ms']:>8.2f} {e['p95_ms']:>8.2f} {e['p99_ms']:>8.2f}",
+              file=sys.stderr)
+    print(f"memory: {memory}", file=sys.stderr)
+    if sqlite:
+        print(f"sqlite: {sqlite}", file=sys.stderr)
+
+    body = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(body + "\n")
+    print(body, file=report_out)
+
+
+if __name__ == "__main__":
+    main()
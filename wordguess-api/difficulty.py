@@ -0,0 +1,166 @@
+"""
+Word difficulty for Words Guess Game
+Every word gets a score in [0, 1] from its letters, computed for a whole batch
+of words at once with NumPy, and each (topic, length) bucket keeps its words
+sorted by that score so a game can draw from a difficulty band in O(1), and
+a band's score range can pick matching words out of another index.
+
+Features:
+    wrong guesses   misses by a player who guesses letters from most to least
+                    common before every letter of the word is found
+    rarity          mean rarity of the word's distinct letters
+    distinct        distinct letters over word length; repeats mean fewer
+                    letters to find ("BEE" needs two guesses, "FOX" three)
+"""
+
+import random
+
+import numpy as np
+
+# English letter frequencies in percent, A..Z
+LETTER_FREQUENCY = np.array([
+    8.2, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.15, 0.77, 4.0, 2.4,
+    6.7, 7.5, 1.9, 0.095, 6.0, 6.3, 9.1, 2.8, 0.98, 2.4, 0.15, 2.0, 0.074,
+])
+ALPHABET = len(LETTER_FREQUENCY)
+GUESS_RANK = np.argsort(np.argsort(-LETTER_FREQUENCY, kind="stable"))  # 0 = guessed first
+RARITY = 1 - LETTER_FREQUENCY / LETTER_FREQUENCY.max()
+WEIGHTS = {"wrong_guesses": 0.5, "rarity": 0.3, "distinct": 0.2}
+BAND = 0.5           # width of a difficulty band, as a fraction of the bucket
+MIN_BAND_WORDS = 5   # so small buckets still vary
+SCORE_TOLERANCE = 1e-9  # one word scored in different batches may differ by float rounding
+
+
+def letter_codes(words):
+    """(words, longest length) array of letter codes 0-25, padded with ALPHABET"""
+    width = max(map(len, words))
+    padded = "".join(word.ljust(width, "[") for word in words)  # "[" follows "Z"
+    codes = np.frombuffer(padded.encode("ascii"), dtype=np.uint8).reshape(len(words), width)
+    return codes.astype(np.intp) - ord("A")
+
+
+def word_features(words):
+    """Feature arrays for uppercase A-Z words of any lengths"""
+    codes = letter_codes(words)
+    present = np.zeros((len(words), ALPHABET + 1), dtype=bool)
+    present[np.arange(len(words))[:, None], codes] = True
+    present = present[:, :ALPHABET]
+    distinct = present.sum(axis=1)
+    # Every letter ranked before the word's rarest one is guessed, and all but its own letters miss
+    last = np.where(present, GUESS_RANK + 1, 0).max(axis=1)
+    return {
+        "wrong_guesses": last - distinct,
+        "rarity": (present @ RARITY) / distinct,
+        "distinct": distinct / (codes < ALPHABET).sum(axis=1),
+    }
+
+
+def score_words(words):
+    """Difficulty in [0, 1] per word, 1 = hardest"""
+    features = word_features(words)
+    return (
+        WEIGHTS["wrong_guesses"] * features["wrong_guesses"] / (ALPHABET - 1)
+        + WEIGHTS["rarity"] * features["rarity"]
+        + WEIGHTS["distinct"] * features["distinct"]
+    )
+
+
+class DifficultyIndex:
+    """Words per (topic, length) key sorted by difficulty score.
+
+    A target difficulty is a rank in the bucket (0 = easiest word, 1 = hardest),
+    so a band always holds words and a draw is a little arithmetic and a
+    random index. Not thread-safe; callers that add words hold their own lock.
+    """
+
+    def __init__(self):
+        self._words = {}   # key -> object array of words, easiest first
+        self._scores = {}  # key -> ascending scores
+
+    @classmethod
+    def build(cls, buckets):
+        """Index {key: words} with one scoring pass over every word"""
+        index = cls()
+        keys = [key for key, words in buckets.items() if words]
+        if not keys:
+            return index
+        words = np.array([word for key in keys for word in buckets[key]], dtype=object)
+        scores = score_words(words.tolist())
+        splits = np.cumsum([len(buckets[key]) for key in keys])[:-1]
+        for key, bucket_words, bucket_scores in zip(keys, np.split(words, splits), np.split(scores, splits)):
+            order = np.argsort(bucket_scores, kind="stable")
+            index._words[key] = bucket_words[order]
+            index._scores[key] = bucket_scores[order]
+        return index
+
+    def add(self, key, words):
+        """Score new words in one pass and merge them into the key's sorted arrays"""
+        if not words:
+            return
+        scores = score_words(words)
+        order = np.argsort(scores, kind="stable")
+        words = np.array(words, dtype=object)[order]
+        scores = scores[order]
+        if key not in self._scores:
+            self._words[key], self._scores[key] = words, scores
+            return
+        at = np.searchsorted(self._scores[key], scores, side="right")
+        self._words[key] = np.insert(self._words[key], at, words)
+        self._scores[key] = np.insert(self._scores[key], at, scores)
+
+    def discard(self, key, word):
+        """Remove a word from a key, if present"""
+        words = self._words.get(key)
+        if words is None:
+            return
+        found = np.flatnonzero(words == word)
+        if found.size:
+            self._words[key] = np.delete(words, found[0])
+            self._scores[key] = np.delete(self._scores[key], found[0])
+
+    def band_bounds(self, key, target, band=BAND):
+        """(low, high) ranks of the band * n words (at least MIN_BAND_WORDS) placed
+        at the target rank, or None for an empty key"""
+        words = self._words.get(key)
+        if words is None or not len(words):
+            return None
+        n = len(words)
+        count = min(max(int(band * n), MIN_BAND_WORDS), n)
+        low = round(min(max(target, 0.0), 1.0) * (n - count))
+        return low, low + count
+
+    def words(self, key):
+        """Words for a key, easiest first"""
+        return tuple(self._words.get(key, ()))
+
+    def score_bounds(self, key, target, band=BAND):
+        """(lowest, highest) score in the band around the target rank, or None for an empty key"""
+        bounds = self.band_bounds(key, target, band)
+        if bounds is None:
+            return None
+        low, high = bounds
+        scores = self._scores[key]
+        return float(scores[low]), float(scores[high - 1])
+
+    def sample(self, key, target, band=BAND):
+        """Random word from the band around the target rank, or None for an empty key"""
+        bounds = self.band_bounds(key, target, band)
+        if bounds is None:
+            return None
+        low, high = bounds
+        return self._words[key][random.randrange(low, high)]
+
+    def take_between(self, key, low, high):
+        """Remove and return a random word scored in [low, high], or None if there is none"""
+        scores = self._scores.get(key)
+        if scores is None:
+            return None
+        start = np.searchsorted(scores, low - SCORE_TOLERANCE, side="left")
+        stop = np.searchsorted(scores, high + SCORE_TOLERANCE, side="right")
+        if start >= stop:
+            return None
+        i = random.randrange(start, stop)
+        word = self._words[key][i]
+        self._words[key] = np.delete(self._words[key], i)
+        self._scores[key] = np.delete(scores, i)
+        return word
@@ -0,0 +1,96 @@
+"""
+Game session protocol for Words Guess Game
+A client bound to one game sends small JSON messages and gets back only what
+changed (revealed positions, wrong letters, lives, status) instead of the full
+game state. Transport-agnostic; the WebSocket channel lives in asgi.py.
+
+Client messages:
+    {"op": "guess", "letters": "EAR"}   one or more letters, applied in order
+    {"op": "hint"}
+    {"op": "state"}                     full snapshot, e.g. after a reconnect
+"""
+
+import json
+
+MAX_LETTERS = 26
+
+
+def parse_letters(letters):
+    """Uppercase letters from a string or list, or None if any is not A-Z"""
+    if isinstance(letters, list):
+        letters = "".join(str(letter) for letter in letters)
+    if not isinstance(letters, str) or not letters or len(letters) > MAX_LETTERS:
+        return None
+    letters = letters.upper()
+    if not all("A" <= letter <= "Z" for letter in letters):
+        return None
+    return letters
+
+
+def snapshot(gid, g):
+    """Full game state, sent when a session opens"""
+    state = {
+        "game_id": gid,
+        "masked": g.masked_text,
+        "lives": g.lives,
+        "status": g.status,
+        "guessed": g.guessed_list,
+        "level": g.level,
+        "topic": g.topic,
+        "word_length": len(g.word),
+    }
+    if g.answer:
+        state["answer"] = g.answer
+    return state
+
+
+def _delta(g, revealed=(), wrong=()):
+    delta = {"revealed": revealed, "wrong": wrong, "lives": g.lives, "status": g.status}
+    if g.answer:
+        delta["answer"] = g.answer
+    return delta
+
+
+def apply_message(gid, g, message):
+    """Apply one client message to a game; returns the reply to send"""
+    op = message.get("op")
+    if op == "state":
+        return {"state": snapshot(gid, g)}
+    if g.status != "playing":
+        return {"error": "game_over", "status": g.status}
+    if op == "guess":
+        letters = parse_letters(message.get("letters"))
+        if letters is None:
+            return {"error": "invalid_letter"}
+        revealed, wrong = [], []
+        for letter, outcome, positions in g.guess_many(letters):
+            if outcome == "hit":
+                revealed += [[i, letter] for i in positions]
+            elif outcome == "miss":
+                wrong.append(letter)
+        return _delta(g, revealed, wrong)
+    if op == "hint":
+        if not g.hints_left:
+            return {"error": "no_hints_left"}
+        hint = g.hint()
+        if hint is None:
+            return {"error": "all_letters_revealed"}
+        letter, _ = hint
+        return _delta(g, [[i, letter] for i, c in enumerate(g.word) if c == letter])
+    return {"error": "unknown_op"}
+
+
+def handle(games, gid, text):
+    """Decode a message, apply it atomically to the stored game and encode the reply"""
+    try:
+        message = json.loads(text)
+    except ValueError:
+        message = None
+    if not isinstance(message, dict):
+        reply = {"error": "invalid_message"}
+    else:
+        try:
+            reply = games.update(gid, lambda g: apply_message(gid, g, message))
+        except KeyError:
+            reply = {"error": "game_not_found"}
+    return json.dumps(reply, separators=(",", ":"))
@@ -0,0 +1,219 @@
+"""
+Compact game state for Words Guess Game
+Guessed letters and word letters are 26-bit masks, and the masked word is
+updated in place, so guesses, hints and win/loss checks never rescan the word
+"""
+
+from functools import lru_cache
+import json
+import random
+import time
+
+MAX_LIVES = 6
+MAX_HINTS = 3  # per round, matching the client's hint counter
+_A = ord("A")
+_HIDDEN = ord("_")
+
+
+def letter_bit(letter):
+    """Bit for an uppercase letter A-Z"""
+    return 1 << (ord(letter) - _A)
+
+
+@lru_cache(maxsize=4096)
+def word_letter_bits(word):
+    """26-bit mask of the letters in a word, shared by every game using it"""
+    bits = 0
+    for c in word:
+        bits |= letter_bit(c)
+    return bits
+
+
+@lru_cache(maxsize=4096)
+def letter_positions(word):
+    """Letter -> positions index for a word, shared by every game using it"""
+    index = {}
+    for i, c in enumerate(word):
+        index.setdefault(c, []).append(i)
+    return {c: tuple(p) for c, p in index.items()}
+
+
+class GameState:
+    """A single game round; serializes to the same shape as the old game dict"""
+
+    __slots__ = ("word", "lives", "status", "level", "topic",
+                 "guessed", "guessed_bits", "masked", "hidden",
+                 "hints", "started_at", "ended_at", "submitted")
+
+    def __init__(self, word, level=1, topic="animals", lives=MAX_LIVES, status="playing", guessed="",
+                 hints=0, started_at=None, ended_at=None, submitted=False):
+        self.word = word
+        self.level = level
+        self.topic = topic
+        self.lives = lives
+        self.status = status
+        self.hints = hints                     # letters revealed by hints
+        self.started_at = time.time() if started_at is None else started_at
+        self.ended_at = ended_at
+        self.submitted = submitted             # score already recorded for this round
+        self.guessed = ""                      # letters in guess order
+        self.guessed_bits = 0
+        self.masked = bytearray(" ".join("_" * len(word)), "ascii")
+        self.hidden = len(word)                # positions still showing "_"
+        for letter in guessed:
+            self._add(letter)
+
+    def start_level(self, word, level):
+        """Reset in place for the next round on the same topic"""
+        self.__init__(word, level=level, topic=self.topic)
+
+    def _add(self, letter):
+        """Record a letter; returns the word positions it revealed"""
+        self.guessed += letter
+        self.guessed_bits |= letter_bit(letter)
+        positions = letter_positions(self.word).get(letter, ())
+        for i in positions:
+            self.masked[2 * i] = ord(letter)
+        self.hidden -= len(positions)
+        return positions
+
+    def has_guessed(self, letter):
+        return bool(self.guessed_bits & letter_bit(letter))
+
+    def in_word(self, letter):
+        return bool(word_letter_bits(self.word) & letter_bit(letter))
+
+    def guess(self, letter):
+        """Apply a guess and update lives and status; returns revealed positions"""
+        positions = ()
+        if not self.has_guessed(letter):
+            positions = self._add(letter)
+            if not positions:
+                self.lives -= 1
+
+        if self.hidden == 0:
+            self.status = "won"
+        elif self.lives <= 0:
+            self.status = "lost"
+        if self.status != "playing" and self.ended_at is None:
+            self.ended_at = time.time()
+        return positions
+
+    def guess_many(self, letters):
+        """Apply guesses in order; returns (letter, outcome, positions) for each.
+        Outcome is hit, miss or repeat, and skipped once the round has ended."""
+        results = []
+        for letter in letters:
+            if self.status != "playing":
+                results.append((letter, "skipped", ()))
+            elif self.has_guessed(letter):
+                results.append((letter, "repeat", ()))
+            else:
+                positions = self.guess(letter)
+                results.append((letter, "hit" if positions else "miss", positions))
+        return results
+
+    def unrevealed_positions(self):
+        return [i for i in range(len(self.word)) if self.masked[2 * i] == _HIDDEN]
+
+    def reveal(self, letter):
+        """Reveal a letter for a hint without costing a life; revealing the
+        last hidden letter wins the round"""
+        if self.has_guessed(letter):
+            return ()
+        self.hints += 1
+        positions = self._add(letter)
+        if self.hidden == 0 and self.status == "playing":
+            self.status = "won"
+            self.ended_at = time.time()
+        return positions
+
+    @property
+    def hints_left(self):
+        return max(MAX_HINTS - self.hints, 0)
+
+    def hint(self):
+        """Reveal the letter at a random hidden position; (letter, position), or None
+        when every letter is showing or the round's hints are used up"""
+        positions = self.unrevealed_positions()
+        if not positions or not self.hints_left:
+            return None
+        position = random.choice(positions)
+        letter = self.word[position]
+        self.reveal(letter)
+        return letter, position
+
+    def claim_submission(self):
+        """Mark a finished round as scored; False if still playing or already scored"""
+        if self.status == "playing" or self.submitted:
+            return False
+        self.submitted = True
+        return True
+
+    def stats(self):
+        """Score inputs for a finished round, derived from the recorded play"""
+        guesses = len(self.guessed) - self.hints
+        correct = sum(1 for c in self.guessed if self.in_word(c)) - self.hints
+        ended_at = self.ended_at or time.time()
+        return {
+            "won": self.status == "won",
+            "word": self.word,
+            "word_length": len(self.word),
+            "mistakes": MAX_LIVES - self.lives,
+            "correct": correct,
+            "accuracy": correct / guesses * 100 if guesses else 0.0,
+            "duration_ms": int((ended_at - self.started_at) * 1000),
+            "level": self.level,
+            "topic": self.topic,
+            "hints": self.hints,
+        }
+
+    @property
+    def masked_text(self):
+        return self.masked.decode("ascii")
+
+    @property
+    def guessed_list(self):
+        return list(self.guessed)
+
+    @property
+    def answer(self):
+        """The word, only once the game is over"""
+        return self.word if self.status in ("won", "lost") else None
+
+    def to_record(self):
+        return {
+            "word": self.word,
+            "guessed": self.guessed_list,
+            "lives": self.lives,
+            "status": self.status,
+            "level": self.level,
+            "topic": self.topic,
+            "hints": self.hints,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "submitted": self.submitted,
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(
+            record["word"],
+            level=record.get("level", 1),
+            topic=record.get("topic", "animals"),
+            lives=record.get("lives", MAX_LIVES),
+            status=record.get("status", "playing"),
+            guessed="".join(record.get("guessed", ())),
+            hints=record.get("hints", 0),
+            started_at=record.get("started_at"),
+            ended_at=record.get("ended_at"),
+            submitted=record.get("submitted", False),
+        )
+
+    @staticmethod
+    def dumps(game):
+        return json.dumps(game.to_record())
+
+    @staticmethod
+    def loads(data):
+        return GameState.from_record(json.loads(data))
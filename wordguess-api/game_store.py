@@ -0,0 +1,196 @@
+"""
+Game state storage for Words Guess Game
+Keyed by game id with TTL eviction; in-process LRU or SQLite shared across workers
+"""
+
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class GameStore:
+    """Interface for game state backends. Expired games are swept lazily."""
+
+    def get(self, gid):
+        """Return the game for an id, or None if missing or expired"""
+        raise NotImplementedError
+
+    def put(self, gid, game):
+        """Insert or replace a game and refresh its TTL"""
+        raise NotImplementedError
+
+    def delete(self, gid):
+        """Remove a game if present"""
+        raise NotImplementedError
+
+    def update(self, gid, fn):
+        """Atomically apply fn to a stored game and save it; returns fn's result.
+        Raises KeyError if the game is missing or expired."""
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __contains__(self, gid):
+        return self.get(gid) is not None
+
+
+class MemoryGameStore(GameStore):
+    """Per-process LRU with a sliding TTL.
+
+    Entries are kept in access order, so the least recently used game is also
+    the one that expires first; sweeping only ever inspects the front.
+    """
+
+    def __init__(self, ttl=3600, max_games=100_000):
+        self.ttl = ttl
+        self.max_games = max_games
+        self._games = OrderedDict()  # gid -> (expires_at, game)
+        self._lock = threading.Lock()
+
+    def _sweep(self, now):
+        while self._games:
+            gid, (expires_at, _) = next(iter(self._games.items()))
+            if expires_at > now:
+                break
+            del self._games[gid]
+
+    def get(self, gid):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._games.get(gid)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._games[gid]
+                return None
+            self._games[gid] = (now + self.ttl, entry[1])
+            self._games.move_to_end(gid)
+            return entry[1]
+
+    def put(self, gid, game):
+        now = time.monotonic()
+        with self._lock:
+            self._games[gid] = (now + self.ttl, game)
+            self._games.move_to_end(gid)
+            self._sweep(now)
+            while len(self._games) > self.max_games:
+                self._games.popitem(last=False)
+
+    def delete(self, gid):
+        with self._lock:
+            self._games.pop(gid, None)
+
+    def update(self, gid, fn):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._games.get(gid)
+            if entry is None or entry[0] <= now:
+                raise KeyError(gid)
+            result = fn(entry[1])
+            self._games[gid] = (now + self.ttl, entry[1])
+            self._games.move_to_end(gid)
+            return result
+
+    def __len__(self):
+        with self._lock:
+            self._sweep(time.monotonic())
+            return len(self._games)
+
+
+class SQLiteGameStore(GameStore):
+    """Games stored in a SQLite file that several worker processes can share"""
+
+    SWEEP_EVERY = 500  # puts between expired-row sweeps
+
+    def __init__(self, path, ttl=3600, encode=json.dumps, decode=json.loads):
+        self.path = path
+        self.ttl = ttl
+        self.encode = encode
+        self.decode = decode
+        self._local = threading.local()
+        self._puts = 0
+        os.register_at_fork(after_in_child=self._after_fork)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS games ("
+                "id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_games_expires_at ON games (expires_at)")
+
+    def _after_fork(self):
+        # SQLite connections must not cross a fork; each worker opens its own
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, gid):
+        row = self._conn().execute(
+            "SELECT data FROM games WHERE id = ? AND expires_at > ?", (gid, time.time())
+        ).fetchone()
+        return self.decode(row[0]) if row else None
+
+    def put(self, gid, game):
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO games (id, data, expires_at) VALUES (?, ?, ?)",
+                (gid, self.encode(game), now + self.ttl),
+            )
+            self._puts += 1
+            if self._puts % self.SWEEP_EVERY == 0:
+                conn.execute("DELETE FROM games WHERE expires_at <= ?", (now,))
+
+    def delete(self, gid):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM games WHERE id = ?", (gid,))
+
+    def update(self, gid, fn):
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")  # take the write lock before reading
+        try:
+            row = conn.execute(
+                "SELECT data FROM games WHERE id = ? AND expires_at > ?", (gid, now)
+            ).fetchone()
+            if row is None:
+                raise KeyError(gid)
+            game = self.decode(row[0])
+            result = fn(game)
+            conn.execute(
+                "UPDATE games SET data = ?, expires_at = ? WHERE id = ?",
+                (self.encode(game), now + self.ttl, gid),
+            )
+            conn.commit()
+            return result
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def __len__(self):
+        row = self._conn().execute(
+            "SELECT COUNT(*) FROM games WHERE expires_at > ?", (time.time(),)
+        ).fetchone()
+        return row[0]
+
+
+def make_game_store(backend=None, ttl=None, **kwargs):
+    """Build the game store selected by GAME_STORE (memory or sqlite)"""
+    backend = backend or os.getenv("GAME_STORE", "memory")
+    ttl = ttl or int(os.getenv("GAME_TTL", 3600))
+    if backend == "sqlite":
+        path = os.getenv("GAME_STORE_PATH") or os.path.join(os.path.dirname(__file__), "games.db")
+        return SQLiteGameStore(path, ttl=ttl, **kwargs)
+    if backend == "memory":
+        return MemoryGameStore(ttl=ttl, max_games=int(os.getenv("GAME_STORE_MAX", 100_000)))
+    raise ValueError(f"Unknown GAME_STORE backend: {backend}")
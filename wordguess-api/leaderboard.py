@@ -3,10 +3,27 @@ Leaderboard API endpoints for Words Guess Game
 Uses SQLite with SQLAlchemy for persistent score storage
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, func, insert, select, bindparam, case, inspect, text, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
 from datetime import datetime, timezone
+import click
+import csv
+import functools
+import io
+import json
+import logging
 import os
+import time
+import zlib
+from leaderboard_cache import WINDOWS, Leaderboards
+from metrics import DB_COMMIT_SECONDS
+from score_ingest import ScoreIngestQueue
+
+log = logging.getLogger(__name__)
 
 # Create blueprint
 leaderboard_bp = Blueprint('leaderboard', __name__)
@@ -14,6 +31,26 @@ leaderboard_bp = Blueprint('leaderboard', __name__)
 # Database setup
 db = SQLAlchemy()
 
+# Top scores per window/topic/level served from memory; each board is reseeded
+# from the database at most every few seconds
+MAX_LEADERBOARD = 100
+LEADERBOARDS = Leaderboards(
+    capacity=MAX_LEADERBOARD,
+    refresh_interval=float(os.getenv('LEADERBOARD_REFRESH', 5)),
+    max_boards=int(os.getenv('LEADERBOARD_MAX_BOARDS', 256)),
+)
+
+# Write-behind score ingestion: accepted scores are bulk-inserted in the background
+WRITE_BEHIND = os.getenv('SCORE_WRITE_BEHIND', '1') != '0'
+SCORE_QUEUE = ScoreIngestQueue(
+    None,  # writer is bound to the app in init_db
+    max_batch=int(os.getenv('SCORE_FLUSH_BATCH', 200)),
+    max_delay=float(os.getenv('SCORE_FLUSH_DELAY', 0.5)),
+    max_depth=int(os.getenv('SCORE_QUEUE_MAX', 10_000)),
+    max_attempts=int(os.getenv('SCORE_FLUSH_ATTEMPTS', 5)),
+    transient=(OperationalError,),  # "database is locked" and the like: retried, never dropped
+)
+
 class Score(db.Model):
     """Score model for persistent leaderboard storage"""
     __tablename__ = 'scores'
@@ -29,6 +66,8 @@ class Score(db.Model):
     duration_ms = db.Column(db.Integer, nullable=False, default=0)
     score = db.Column(db.Integer, nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    topic = db.Column(db.String(32), nullable=True)  # NULL for scores recorded before topics were stored
+    level = db.Column(db.Integer, nullable=True)
     
     def to_dict(self):
         """Convert model to dictionary for JSON response"""
@@ -43,13 +82,200 @@ class Score(db.Model):
             'accuracy': round(self.accuracy, 1),
             'duration_ms': self.duration_ms,
             'score': self.score,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at.isoformat(),
+            'topic': self.topic,
+            'level': self.level
+        }
+
+# Composite indexes so player history and the leaderboard read rows in index order
+# instead of sorting: (player, created_at DESC) and (score DESC, created_at DESC)
+db.Index('ix_scores_player_created_at', Score.player, Score.created_at.desc())
+db.Index('ix_scores_score_created_at', Score.score.desc(), Score.created_at.desc())
+# Filtered leaderboards: all-time boards read (topic, level) in score order, and
+# daily/weekly boards range-scan only the window's rows
+db.Index('ix_scores_topic_level_score', Score.topic, Score.level, Score.score.desc(), Score.created_at.desc())
+db.Index('ix_scores_topic_level_created_at', Score.topic, Score.level, Score.created_at)
+
+class PlayerStats(db.Model):
+    """Per-player aggregates, updated in the same transaction as each score insert"""
+    __tablename__ = 'player_stats'
+    
+    player = db.Column(db.String(64), primary_key=True)
+    games = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    best_score = db.Column(db.Integer, nullable=False, default=0, index=True)
+    total_accuracy = db.Column(db.Float, nullable=False, default=0.0)
+    current_streak = db.Column(db.Integer, nullable=False, default=0)  # consecutive wins, newest game last
+    best_streak = db.Column(db.Integer, nullable=False, default=0)
+    last_played = db.Column(db.DateTime, nullable=True)
+    
+    def to_dict(self):
+        """Convert model to dictionary for JSON response"""
+        return {
+            'player': self.player,
+            'games': self.games,
+            'wins': self.wins,
+            'losses': self.games - self.wins,
+            'win_rate': round(self.wins / self.games * 100, 1) if self.games else 0.0,
+            'best_score': self.best_score,
+            'avg_accuracy': round(self.total_accuracy / self.games, 1) if self.games else 0.0,
+            'current_streak': self.current_streak,
+            'best_streak': self.best_streak,
+            'last_played': self.last_played.isoformat() if self.last_played else None
         }
 
-def compute_score(won, word_length, mistakes, duration_ms, accuracy, level=1):
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',       # readers no longer block the writer
+    'PRAGMA synchronous=NORMAL',     # fsync at checkpoints, safe with WAL
+    'PRAGMA busy_timeout=5000',      # wait for the write lock instead of failing
+    'PRAGMA cache_size=-16000',      # 16 MB page cache per connection
+    'PRAGMA temp_store=MEMORY',
+)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+@event.listens_for(Session, 'before_commit')
+def _commit_started(session):
+    session.info['commit_started'] = time.perf_counter()
+
+@event.listens_for(Session, 'after_commit')
+def _commit_finished(session):
+    started = session.info.pop('commit_started', None)
+    if started is not None:
+        DB_COMMIT_SECONDS.observe(time.perf_counter() - started)
+
+def record_to_dict(record):
+    """JSON shape of a queued score, matching Score.to_dict (the id is assigned on flush)"""
+    return {
+        'id': None,
+        'player': record['player'],
+        'won': record['won'],
+        'word': record['word'],
+        'word_length': record['word_length'],
+        'mistakes': record['mistakes'],
+        'correct': record['correct'],
+        'accuracy': round(record['accuracy'], 1),
+        'duration_ms': record['duration_ms'],
+        'score': record['score'],
+        'created_at': record['created_at'].isoformat(),
+        'topic': record['topic'],
+        'level': record['level']
+    }
+
+def aggregate_scores(records):
+    """Fold chronologically ordered score records into per-player deltas for PlayerStats"""
+    deltas = {}
+    for r in records:
+        d = deltas.get(r['player'])
+        if d is None:
+            d = deltas[r['player']] = {
+                'p_player': r['player'], 'p_games': 0, 'p_wins': 0, 'p_best_score': 0,
+                'p_total_accuracy': 0.0, 'p_leading': 0, 'p_trailing': 0, 'p_best_run': 0,
+                'p_all_won': True, 'p_last_played': r['created_at'],
+            }
+        d['p_games'] += 1
+        d['p_best_score'] = max(d['p_best_score'], r['score'])
+        d['p_total_accuracy'] += r['accuracy']
+        d['p_last_played'] = max(d['p_last_played'], r['created_at'])
+        if r['won']:
+            d['p_wins'] += 1
+            d['p_trailing'] += 1
+            if d['p_all_won']:
+                d['p_leading'] += 1
+            d['p_best_run'] = max(d['p_best_run'], d['p_trailing'])
+        else:
+            d['p_trailing'] = 0
+            d['p_all_won'] = False
+    return deltas
+
+def upsert_player_stats(deltas):
+    """Apply per-player deltas in one executemany upsert.
+    Streaks extend the stored current streak only while the new games are all wins."""
+    if not deltas:
+        return
+    table = PlayerStats.__table__
+    c = table.c
+    stmt = sqlite_insert(table).values(
+        player=bindparam('p_player'),
+        games=bindparam('p_games'),
+        wins=bindparam('p_wins'),
+        best_score=bindparam('p_best_score'),
+        total_accuracy=bindparam('p_total_accuracy'),
+        current_streak=bindparam('p_trailing'),
+        best_streak=bindparam('p_best_run'),
+        last_played=bindparam('p_last_played'),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[c.player],
+        set_={
+            'games': c.games + bindparam('p_games'),
+            'wins': c.wins + bindparam('p_wins'),
+            'best_score': func.max(c.best_score, bindparam('p_best_score')),
+            'total_accuracy': c.total_accuracy + bindparam('p_total_accuracy'),
+            'current_streak': case(
+                (bindparam('p_all_won'), c.current_streak + bindparam('p_games')),
+                else_=bindparam('p_trailing'),
+            ),
+            'best_streak': func.max(c.best_streak, c.current_streak + bindparam('p_leading'),
+                                    bindparam('p_best_run')),
+            'last_played': func.max(c.last_played, bindparam('p_last_played')),
+        },
+    )
+    db.session.execute(stmt, list(deltas.values()))
+
+def write_scores(app, records):
+    """Bulk-insert queued score records and their player stats in one transaction"""
+    with app.app_context():
+        try:
+            db.session.execute(insert(Score.__table__), records)
+            upsert_player_stats(aggregate_scores(records))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+EXPORT_COLUMNS = ('id', 'player', 'won', 'word', 'word_length', 'mistakes', 'correct', 'accuracy',
+                  'duration_ms', 'score', 'created_at', 'topic', 'level')
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+def export_scores(fmt='ndjson', player=None, batch_size=1000):
+    """Yield stored scores in id order as NDJSON or CSV text, one chunk per batch.
+    Rows are fetched batch_size at a time on a dedicated connection, so memory
+    stays flat at any table size."""
+    table = Score.__table__
+    query = select(*(table.c[name] for name in EXPORT_COLUMNS)).order_by(table.c.id)
+    if player is not None:
+        query = query.where(table.c.player == player)
+    
+    with db.engine.connect() as conn:
+        result = conn.execution_options(yield_per=batch_size).execute(query)
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        if fmt == 'csv':
+            writer.writerow(EXPORT_COLUMNS)
+        for rows in result.partitions():
+            for row in rows:
+                values = row._asdict()
+                values['created_at'] = values['created_at'].isoformat() if values['created_at'] else None
+                if fmt == 'csv':
+                    writer.writerow(values.values())
+                else:
+                    buf.write(json.dumps(values, separators=(',', ':')))
+                    buf.write('\n')
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue()
+
+def compute_score(won, word_length, mistakes, duration_ms, accuracy, level=1, hints=0):
     """
     Compute score based on game performance
-    Formula: base + length_bonus + level_bonus + accuracy_bonus - time_penalty - mistake_penalty
+    Formula: base + length_bonus + level_bonus + accuracy_bonus - time_penalty - mistake_penalty - hint_penalty
     """
     base = 100 if won else 40
     length_bonus = word_length * 8
@@ -57,52 +283,97 @@ def compute_score(won, word_length, mistakes, duration_ms, accuracy, level=1):
     accuracy_bonus = int(accuracy)
     time_penalty = min(duration_ms // 1000, 120)  # Max 2 minutes penalty
     mistake_penalty = mistakes * 6
-    return max(0, base + length_bonus + level_bonus + accuracy_bonus - time_penalty - mistake_penalty)
+    hint_penalty = hints * 15  # A hint is a sure letter, worth more than a saved life
+    return max(0, base + length_bonus + level_bonus + accuracy_bonus - time_penalty - mistake_penalty - hint_penalty)
 
 @leaderboard_bp.route('/api/score', methods=['POST'])
 def submit_score():
-    """Submit a new score to the leaderboard"""
+    """Submit a new score to the leaderboard.
+    With a game_id, stats come from the finished game on the server and only
+    the player name is read from the payload; otherwise the client's stats are used."""
     try:
         data = request.get_json()
         
-        # Validate required fields
-        required_fields = ['player', 'won', 'word_length', 'mistakes', 'correct', 'accuracy', 'duration_ms']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        # Extract and validate data
-        player = str(data['player'])[:64]  # Limit to 64 chars
-        won = bool(data['won'])
-        word = str(data.get('word', ''))[:64] if data.get('word') else None
-        word_length = int(data['word_length'])
-        mistakes = int(data['mistakes'])
-        correct = int(data['correct'])
-        accuracy = float(data['accuracy'])
-        duration_ms = int(data['duration_ms'])
-        level = int(data.get('level', 1))  # Default to level 1 if not provided
+        if data and data.get('game_id'):
+            if 'player' not in data:
+                return jsonify({'error': 'Missing required field: player'}), 400
+            player = str(data['player'])[:64]  # Limit to 64 chars
+            
+            # Claim the round once; stats are derived from the recorded play
+            games = current_app.extensions['game_store']
+            try:
+                stats = games.update(str(data['game_id']), lambda g: g.stats() if g.claim_submission() else g.status)
+            except KeyError:
+                return jsonify({'error': 'game_not_found'}), 404
+            if stats == 'playing':
+                return jsonify({'error': 'game_not_finished'}), 409
+            if not isinstance(stats, dict):
+                return jsonify({'error': 'score_already_submitted'}), 409
+            
+            won = stats['won']
+            word = stats['word']
+            word_length = stats['word_length']
+            mistakes = stats['mistakes']
+            correct = stats['correct']
+            accuracy = stats['accuracy']
+            duration_ms = stats['duration_ms']
+            level = stats['level']
+            topic = stats['topic']
+            hints = stats['hints']
+        else:
+            # Validate required fields
+            required_fields = ['player', 'won', 'word_length', 'mistakes', 'correct', 'accuracy', 'duration_ms']
+            for field in required_fields:
+                if field not in data:
+                    return jsonify({'error': f'Missing required field: {field}'}), 400
+            
+            # Extract and validate data
+            player = str(data['player'])[:64]  # Limit to 64 chars
+            won = bool(data['won'])
+            word = str(data.get('word', ''))[:64] if data.get('word') else None
+            word_length = int(data['word_length'])
+            mistakes = int(data['mistakes'])
+            correct = int(data['correct'])
+            accuracy = float(data['accuracy'])
+            duration_ms = int(data['duration_ms'])
+            level = int(data.get('level', 1))  # Default to level 1 if not provided
+            topic = str(data['topic']).lower()[:32] if data.get('topic') else None
+            hints = int(data.get('hints', 0))
         
         # Compute score server-side
-        score = compute_score(won, word_length, mistakes, duration_ms, accuracy, level)
+        score = compute_score(won, word_length, mistakes, duration_ms, accuracy, level, hints)
         
         # Create new score record
-        new_score = Score(
-            player=player,
-            won=won,
-            word=word,
-            word_length=word_length,
-            mistakes=mistakes,
-            correct=correct,
-            accuracy=accuracy,
-            duration_ms=duration_ms,
-            score=score
-        )
-        
-        # Save to database
+        record = {
+            'player': player,
+            'won': won,
+            'word': word,
+            'word_length': word_length,
+            'mistakes': mistakes,
+            'correct': correct,
+            'accuracy': accuracy,
+            'duration_ms': duration_ms,
+            'score': score,
+            'created_at': datetime.now(timezone.utc).replace(tzinfo=None),
+            'topic': topic,
+            'level': level
+        }
+        
+        # Queue for the background flusher; the leaderboard sees it right away
+        if WRITE_BEHIND and SCORE_QUEUE.put(record):
+            row = record_to_dict(record)
+            LEADERBOARDS.add(row)
+            return jsonify(row), 202
+        
+        # Save to database (write-behind off, or its queue is full)
+        new_score = Score(**record)
         db.session.add(new_score)
+        upsert_player_stats(aggregate_scores([record]))
         db.session.commit()
         
-        return jsonify(new_score.to_dict()), 201
+        row = new_score.to_dict()
+        LEADERBOARDS.add(row)
+        return jsonify(row), 201
         
     except Exception as e:
         db.session.rollback()
@@ -110,48 +381,255 @@ def submit_score():
 
 @leaderboard_bp.route('/api/leaderboard', methods=['GET'])
 def get_leaderboard():
-    """Get top scores for the leaderboard"""
+    """Get top scores for the leaderboard.
+    Optional filters: window (all, weekly, daily), topic and level."""
     try:
-        limit = min(int(request.args.get('limit', 20)), 100)  # Max 100 results
+        limit = min(int(request.args.get('limit', 20)), MAX_LEADERBOARD)  # Max 100 results
+        window = request.args.get('window', 'all')
+        if window not in WINDOWS:
+            return jsonify({'error': f'Invalid window: {window}'}), 400
+        topic = request.args.get('topic', '').lower()[:32] or None
+        level = request.args.get('level', type=int)
         
-        # Query top scores ordered by score DESC, then by created_at DESC
-        scores = Score.query.order_by(
-            Score.score.desc(),
-            Score.created_at.desc()
-        ).limit(limit).all()
+        key, board = LEADERBOARDS.board(window, topic, level)
+        board.refresh(functools.partial(board_rows, key))
         
-        return jsonify([score.to_dict() for score in scores])
+        # Pre-serialized top scores, with a 304 when the client's copy is current
+        etag, body = board.payload(limit)
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response.make_conditional(request)
         
     except Exception as e:
         return jsonify({'error': f'Failed to fetch leaderboard: {str(e)}'}), 500
 
 @leaderboard_bp.route('/api/player/<player>/scores', methods=['GET'])
 def get_player_scores(player):
-    """Get recent scores for a specific player"""
+    """Get a page of a player's scores, newest first.
+    Pass the X-Next-Cursor header of one page as ?cursor= to get the next; each
+    page is an index range scan from the cursor, so deep pages cost the same."""
     try:
         limit = min(int(request.args.get('limit', 50)), 100)  # Max 100 results
+        cursor = request.args.get('cursor')
         
-        # Query player's scores ordered by created_at DESC
-        scores = Score.query.filter_by(player=player).order_by(
-            Score.created_at.desc()
+        query = Score.query.filter_by(player=player)
+        if cursor:
+            try:
+                created_at, _, last_id = cursor.rpartition(',')
+                after = (datetime.fromisoformat(created_at), int(last_id))
+            except ValueError:
+                return jsonify({'error': 'invalid_cursor'}), 400
+            query = query.filter(tuple_(Score.created_at, Score.id) < after)
+        elif SCORE_QUEUE.pending(lambda record: record['player'] == player):
+            # Write out this player's queued scores so every page comes from one ordering
+            SCORE_QUEUE.flush()
+        
+        # Query player's scores ordered by created_at DESC, id DESC (the cursor order)
+        scores = query.order_by(
+            Score.created_at.desc(),
+            Score.id.desc()
         ).limit(limit).all()
         
-        return jsonify([score.to_dict() for score in scores])
+        response = jsonify([score.to_dict() for score in scores])
+        if scores and len(scores) == limit:
+            last = scores[-1]
+            response.headers['X-Next-Cursor'] = f'{last.created_at.isoformat()},{last.id}'
+        return response
         
     except Exception as e:
         return jsonify({'error': f'Failed to fetch player scores: {str(e)}'}), 500
 
+@leaderboard_bp.route('/api/scores/export', methods=['GET'])
+def export_scores_endpoint():
+    """Stream every score (optionally one player's) as NDJSON or CSV"""
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f'Invalid format: {fmt}'}), 400
+    player = request.args.get('player')
+    
+    SCORE_QUEUE.flush()  # include scores accepted but not yet written
+    return Response(
+        stream_with_context(export_scores(fmt, player)),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename=scores.{fmt}'},
+    )
+
+@leaderboard_bp.route('/api/player/<player>/stats', methods=['GET'])
+def get_player_stats(player):
+    """Get aggregate stats for a player (single primary-key lookup)"""
+    try:
+        # Write out this player's queued scores first so the stats include them
+        if SCORE_QUEUE.pending(lambda record: record['player'] == player):
+            SCORE_QUEUE.flush()
+        
+        stats = db.session.get(PlayerStats, player)
+        if stats is None:
+            return jsonify({'error': 'player_not_found'}), 404
+        return jsonify(stats.to_dict())
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to fetch player stats: {str(e)}'}), 500
+
+@leaderboard_bp.route('/api/player/<player>/rank', methods=['GET'])
+def get_player_rank(player):
+    """Get the leaderboard position of a player's best score"""
+    try:
+        if SCORE_QUEUE.pending(lambda record: record['player'] == player):
+            SCORE_QUEUE.flush()
+        
+        stats = db.session.get(PlayerStats, player)
+        if stats is None:
+            return jsonify({'error': 'player_not_found'}), 404
+        
+        # Range count on the score index: scores strictly above the player's best
+        above = db.session.execute(
+            select(func.count()).select_from(Score).where(Score.score > stats.best_score)
+        ).scalar()
+        return jsonify({'player': player, 'best_score': stats.best_score, 'rank': above + 1})
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to fetch player rank: {str(e)}'}), 500
+
+@leaderboard_bp.cli.command('backfill-stats')
+def backfill_player_stats():
+    """Rebuild player_stats from scores in one streaming pass"""
+    batch_players = 500
+    db.session.execute(PlayerStats.__table__.delete())
+    
+    # Rows arrive grouped by player and in play order, so only one player is held at a time
+    rows = db.session.execute(
+        select(Score.player, Score.won, Score.score, Score.accuracy, Score.created_at)
+        .order_by(Score.player, Score.created_at, Score.id)
+        .execution_options(yield_per=1000)
+    )
+    deltas, player, current, total = {}, None, [], 0
+    for row in rows.mappings():
+        if row['player'] != player and current:
+            deltas.update(aggregate_scores(current))
+            current = []
+            if len(deltas) >= batch_players:
+                upsert_player_stats(deltas)
+                total += len(deltas)
+                deltas = {}
+        player = row['player']
+        current.append(row)
+    if current:
+        deltas.update(aggregate_scores(current))
+    upsert_player_stats(deltas)
+    total += len(deltas)
+    db.session.commit()
+    click.echo(f"Rebuilt stats for {total} players")
+
+@leaderboard_bp.cli.command('export-scores')
+@click.option('--format', 'fmt', type=click.Choice(sorted(EXPORT_FORMATS)), default='ndjson')
+@click.option('--player', default=None, help='Only this player\'s scores')
+@click.option('--output', type=click.File('w'), default='-', help='File to write (default: stdout)')
+def export_scores_command(fmt, player, output):
+    """Stream scores to a file as NDJSON or CSV"""
+    for chunk in export_scores(fmt, player):
+        output.write(chunk)
+
+def board_rows(key):
+    """Top score rows for one leaderboard board, from the database and the ingest queue"""
+    window, start, topic, level = key
+    query = Score.query
+    if topic is not None:
+        query = query.filter(Score.topic == topic)
+    if level is not None:
+        query = query.filter(Score.level == level)
+    if start is not None:
+        query = query.filter(Score.created_at >= start)
+    
+    # Query top scores ordered by score DESC, then by created_at DESC
+    scores = query.order_by(
+        Score.score.desc(),
+        Score.created_at.desc()
+    ).limit(MAX_LEADERBOARD).all()
+    
+    # Scores still waiting for the flusher belong on the board too
+    queued = SCORE_QUEUE.pending(lambda record: (
+        (topic is None or record['topic'] == topic)
+        and (level is None or record['level'] == level)
+        and (start is None or record['created_at'] >= start)
+    ))
+    return [score.to_dict() for score in scores] + [record_to_dict(record) for record in queued]
+
+def migrate_schema(conn):
+    """Bring an existing database up to the current models on an open connection.
+    create_all() only creates missing tables, so columns and indexes added later are created here."""
+    inspector = inspect(conn)
+    for table in db.metadata.sorted_tables:
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=conn.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+def schema_fingerprint():
+    """Checksum of the models' tables, columns and indexes; a database stamped with it is current"""
+    parts = []
+    for table in db.metadata.sorted_tables:
+        parts.append(table.name)
+        parts += [f'{column.name}:{column.type!r}' for column in table.columns]
+        parts += sorted(f'{index.name}:{",".join(c.name for c in index.columns)}' for index in table.indexes)
+    return zlib.crc32('|'.join(parts).encode()) & 0x7FFFFFFF  # fits SQLite's signed 32-bit user_version
+
+def setup_schema(force=False):
+    """Create missing tables, columns and indexes, then stamp the database with the schema fingerprint.
+    Runs in one BEGIN IMMEDIATE transaction, so workers starting together against a new database
+    take turns: the first sets the schema up and the rest find it stamped and return False."""
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.exec_driver_sql('BEGIN IMMEDIATE')  # the write lock, held until COMMIT
+        try:
+            if not force and conn.exec_driver_sql('PRAGMA user_version').scalar() == schema_fingerprint():
+                conn.exec_driver_sql('ROLLBACK')
+                return False
+            db.metadata.create_all(bind=conn)
+            migrate_schema(conn)
+            conn.exec_driver_sql(f'PRAGMA user_version = {schema_fingerprint()}')
+            conn.exec_driver_sql('COMMIT')
+        except BaseException:
+            conn.exec_driver_sql('ROLLBACK')
+            raise
+    return True
+
+def schema_current():
+    """Whether setup_schema already ran against this database for the current models"""
+    with db.engine.connect() as conn:
+        return conn.execute(text('PRAGMA user_version')).scalar() == schema_fingerprint()
+
+@leaderboard_bp.cli.command('init-db')
+def init_db_command():
+    """Create or migrate the database schema (run once per deploy, before workers start)"""
+    setup_schema(force=True)
+    click.echo(f"Schema ready: {db.engine.url.database}")
+
 def init_db(app):
-    """Initialize database with the Flask app"""
+    """Initialize database with the Flask app.
+    Schema setup runs only when the database predates the current models (SCHEMA_SETUP=auto),
+    so after a deploy's `flask --app app leaderboard init-db` each worker does one PRAGMA read."""
     # Configure SQLite database
-    db_path = os.path.join(os.path.dirname(__file__), 'wordguess.db')
+    db_path = app.config.get('DB_PATH') or os.path.join(os.path.dirname(__file__), 'wordguess.db')
     app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
     # Initialize database
     db.init_app(app)
     
-    # Create tables if they don't exist
     with app.app_context():
-        db.create_all()
-        print(f"Database initialized: {db_path}")
+        event.listen(db.engine, 'connect', _set_sqlite_pragmas)
+        if app.config.get('SCHEMA_SETUP', 'auto') == 'auto' and not schema_current() and setup_schema():
+            log.info("Database schema set up: %s", db_path)
+        # Hand no open connections to forked workers
+        db.engine.dispose()
+    
+    # The write-behind flusher starts with the first request (start_score_flusher)
+    SCORE_QUEUE.write = functools.partial(write_scores, app)
+
+def start_score_flusher():
+    """Start this process's write-behind flusher; a no-op when it is running or disabled"""
+    if WRITE_BEHIND:
+        SCORE_QUEUE.start()
@@ -0,0 +1,162 @@
+"""
+In-memory leaderboard cache for Words Guess Game
+Keeps the top scores sorted and serves pre-serialized JSON per limit
+"""
+
+from bisect import insort
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+import threading
+import time
+
+
+def rank_key(row):
+    """Sort key matching ORDER BY score DESC, created_at DESC (ascending list, best last)"""
+    return (row['score'], row['created_at'], row['id'] or 0)  # queued rows have no id yet
+
+
+class TopScores:
+    """Top-K score rows kept in rank order, with cached JSON bytes and ETags per limit.
+
+    Rows are added as scores are committed. Other worker processes also write
+    scores, so the cache is reseeded from the database at most every
+    refresh_interval seconds.
+    """
+
+    def __init__(self, capacity=100, refresh_interval=5.0):
+        self.capacity = capacity
+        self.refresh_interval = refresh_interval
+        self._entries = []     # (rank_key, row), ascending, best last
+        self._payloads = {}    # limit -> (etag, body)
+        self._version = 0      # bumped on every change, so stale payloads are not cached
+        self._seeded_at = None
+        self._lock = threading.Lock()
+        self._reseed_lock = threading.Lock()  # held by the one caller reloading the board
+
+    def seed(self, rows):
+        """Replace the cache contents with rows loaded from the database"""
+        entries = sorted((rank_key(row), row) for row in rows)[-self.capacity:]
+        with self._lock:
+            self._entries = entries
+            self._payloads = {}
+            self._version += 1
+            self._seeded_at = time.monotonic()
+
+    def stale(self):
+        seeded_at = self._seeded_at
+        return seeded_at is None or time.monotonic() - seeded_at >= self.refresh_interval
+
+    def refresh(self, load):
+        """Reseed from load() if the board is stale; returns whether this caller did.
+        One caller reloads at a time while the others keep serving the cached rows,
+        except before the first seed, when they wait for it."""
+        if not self.stale():
+            return False
+        if not self._reseed_lock.acquire(blocking=self._seeded_at is None):
+            return False
+        try:
+            if not self.stale():
+                return False
+            self.seed(load())
+            return True
+        finally:
+            self._reseed_lock.release()
+
+    def add(self, row):
+        """Insert a newly committed score if it makes the top K"""
+        entry = (rank_key(row), row)
+        with self._lock:
+            if len(self._entries) >= self.capacity and entry <= self._entries[0]:
+                return False
+            insort(self._entries, entry)
+            if len(self._entries) > self.capacity:
+                del self._entries[0]
+            self._payloads = {}
+            self._version += 1
+            return True
+
+    def payload(self, limit):
+        """(etag, JSON bytes) for the top `limit` rows.
+        Serialized outside the lock so score inserts never wait on json.dumps."""
+        with self._lock:
+            cached = self._payloads.get(limit)
+            if cached is not None:
+                return cached
+            version = self._version
+            rows = [row for _, row in reversed(self._entries[-limit:])] if limit > 0 else []
+        body = json.dumps(rows, separators=(',', ':'), sort_keys=True).encode()
+        cached = (hashlib.sha1(body).hexdigest()[:20], body)
+        with self._lock:
+            if self._version == version:
+                self._payloads[limit] = cached
+        return cached
+
+
+WINDOWS = ('all', 'weekly', 'daily')
+
+
+def window_start(window, now):
+    """Start of the current window in naive UTC (daily from midnight, weekly from Monday)"""
+    if window == 'all':
+        return None
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if window == 'daily':
+        return day
+    if window == 'weekly':
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f"Unknown leaderboard window: {window}")
+
+
+class Leaderboards:
+    """TopScores boards per (window, window start, topic, level), created on first request.
+
+    A board is keyed by the window it covers, so when a day or week rolls over
+    the next request gets a new key and boards for past windows are evicted.
+    Only boards somebody has asked for exist; the least recently used are
+    dropped beyond max_boards.
+    """
+
+    def __init__(self, capacity=100, refresh_interval=5.0, max_boards=256):
+        self.capacity = capacity
+        self.refresh_interval = refresh_interval
+        self.max_boards = max_boards
+        self._boards = OrderedDict()  # (window, start, topic, level) -> TopScores
+        self._lock = threading.Lock()
+
+    def board(self, window='all', topic=None, level=None, now=None):
+        """(key, TopScores) for the current window; new boards are empty until seeded"""
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        key = (window, window_start(window, now), topic, level)
+        with self._lock:
+            self._evict(now)
+            board = self._boards.get(key)
+            if board is None:
+                board = self._boards[key] = TopScores(self.capacity, self.refresh_interval)
+                while len(self._boards) > self.max_boards:
+                    self._boards.popitem(last=False)
+            else:
+                self._boards.move_to_end(key)
+            return key, board
+
+    def _evict(self, now):
+        current = {window: window_start(window, now) for window in WINDOWS}
+        for key in [key for key in self._boards if key[1] != current[key[0]]]:
+            del self._boards[key]
+
+    def add(self, row):
+        """Offer a new score to every live board whose window and filters it falls in"""
+        created_at = datetime.fromisoformat(row['created_at'])
+        with self._lock:
+            boards = [
+                board for (window, start, topic, level), board in self._boards.items()
+                if (start is None or created_at >= start)
+                and topic in (None, row['topic'])
+                and level in (None, row['level'])
+            ]
+        for board in boards:
+            board.add(row)
+
+    def __len__(self):
+        return len(self._boards)
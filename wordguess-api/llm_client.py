@@ -0,0 +1,220 @@
+"""
+Shared watsonx.ai text-generation client for Words Guess Game
+Pooled keep-alive session, bounded concurrency, retries with jitter and a
+circuit breaker so a degraded provider fails fast to the fallback words.
+requests is imported with the first session, so processes that never call the
+AI API do not pay for it.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+
+DEFAULT_API_URL = "https://us-south.ml.cloud.ibm.com/ml/v1/text/generation?version=2024-11-20"
+DEFAULT_MODEL_ID = "ibm/granite-3.3-8b-instruct"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class LLMError(Exception):
+    """The provider call failed"""
+
+
+class LLMUnavailable(LLMError):
+    """The call was not attempted (no API key, circuit open or too many calls in flight)"""
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures; lets one trial call through after the cooldown"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """Whether a call may be attempted now"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class LLMClient:
+    """Text-generation client shared by every word-generation path"""
+
+    def __init__(self, api_key=None, api_url=DEFAULT_API_URL, model_id=DEFAULT_MODEL_ID,
+                 max_concurrency=4, acquire_timeout=0.5, connect_timeout=3.05, read_timeout=20,
+                 retries=2, backoff=0.5, breaker=None):
+        self.api_key = api_key
+        self.api_url = api_url
+        self.model_id = model_id
+        self.max_concurrency = max_concurrency
+        self.acquire_timeout = acquire_timeout
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.calls = 0  # outbound calls attempted, for calls-per-game tracking
+
+    @property
+    def stream_url(self):
+        return self.api_url.replace("/text/generation?", "/text/generation_stream?", 1)
+
+    @classmethod
+    def from_env(cls):
+        """Build a client from IBM_API_KEY and the LLM_* environment variables"""
+        return cls(
+            api_key=os.getenv("IBM_API_KEY"),
+            api_url=os.getenv("IBM_API_URL", DEFAULT_API_URL),
+            model_id=os.getenv("IBM_MODEL_ID", DEFAULT_MODEL_ID),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 4)),
+            connect_timeout=float(os.getenv("LLM_CONNECT_TIMEOUT", 3.05)),
+            read_timeout=float(os.getenv("LLM_READ_TIMEOUT", 20)),
+            retries=int(os.getenv("LLM_RETRIES", 2)),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", 5)),
+                reset_timeout=float(os.getenv("LLM_BREAKER_RESET", 30)),
+            ),
+        )
+
+    @property
+    def session(self):
+        """Keep-alive session with a connection pool sized to the concurrency limit"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers.update({
+                        "Content-Type": "application/json",
+                        "Authorization": f"Bearer {self.api_key}",
+                    })
+                    self._session = session
+        return self._session
+
+    def _payload(self, prompt, max_new_tokens, temperature, top_p):
+        return {
+            "model_id": self.model_id,
+            "input": prompt,
+            "parameters": {
+                "max_new_tokens": max_new_tokens,
+                "temperature": temperature,
+                "top_p": top_p,
+            },
+        }
+
+    def _acquire(self):
+        if not self.api_key:
+            raise LLMUnavailable("IBM_API_KEY not found in environment variables")
+        # Slot first: allow() hands out the half-open trial, which a slot timeout would leak
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise LLMUnavailable("too many AI calls in flight")
+        if not self.breaker.allow():
+            self._slots.release()
+            raise LLMUnavailable("circuit open")
+        self.calls += 1
+
+    def _post(self, url, payload, stream=False):
+        """POST with retries; returns a 200 response or raises LLMError.
+        Every failed call is recorded with the breaker, so a failed half-open trial re-opens it."""
+        import requests
+        error = None
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    # Full jitter keeps retries from many workers from lining up
+                    time.sleep(random.uniform(0, self.backoff * 2 ** (attempt - 1)))
+                try:
+                    response = self.session.post(url, json=payload, timeout=self.timeout, stream=stream)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = LLMError(f"request failed: {e}")
+                    continue
+                except requests.RequestException as e:
+                    error = LLMError(f"request failed: {e}")  # not transient, so not retried
+                    break
+                if response.status_code == 200:
+                    return response
+                error = LLMError(f"AI API failed: {response.status_code} - {response.text[:200]}")
+                if response.status_code not in RETRY_STATUSES:
+                    break
+        except BaseException:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_failure()
+        raise error
+
+    def generate(self, prompt, max_new_tokens, temperature=0.7, top_p=0.9):
+        """Return the generated text for a prompt.
+        Raises LLMUnavailable without calling out, or LLMError once retries are exhausted."""
+        self._acquire()
+        try:
+            response = self._post(self.api_url, self._payload(prompt, max_new_tokens, temperature, top_p))
+            self.breaker.record_success()
+            data = response.json()
+            return data.get("results", [{}])[0].get("generated_text", "")
+        finally:
+            self._slots.release()
+
+    def generate_stream(self, prompt, max_new_tokens, temperature=0.7, top_p=0.9):
+        """Yield generated text chunks from the server-sent-events endpoint as they arrive.
+        Errors are raised like generate(); the concurrency slot is held until the stream ends."""
+        import requests
+        self._acquire()
+        try:
+            response = self._post(self.stream_url, self._payload(prompt, max_new_tokens, temperature, top_p),
+                                  stream=True)
+            self.breaker.record_success()
+            with response:
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    try:
+                        event = json.loads(line[5:])
+                    except ValueError:
+                        continue
+                    text = event.get("results", [{}])[0].get("generated_text", "")
+                    if text:
+                        yield text
+        except requests.RequestException as e:
+            # The connection broke mid-stream; counts against the breaker like a failed call
+            self.breaker.record_failure()
+            raise LLMError(f"stream failed: {e}") from e
+        finally:
+            self._slots.release()
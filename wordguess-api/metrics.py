@@ -0,0 +1,147 @@
+"""
+Metrics for Words Guess Game
+Counters, gauges and histograms kept in process memory and rendered in the
+Prometheus text format at /api/metrics. Recording is a dict lookup and an add
+under a lock, cheap enough for every request.
+"""
+
+from bisect import bisect_left
+import threading
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic count per label combination"""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.label_names, labels)} {_number(value)}" for labels, value in values
+        ]
+
+
+class Gauge(_Metric):
+    """Value read from a callback when metrics are scraped"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, read):
+        super().__init__(name, help)
+        self.read = read
+
+    def render(self):
+        return self.header() + [f"{self.name} {_number(self.read())}"]
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed buckets (seconds), per label combination"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value, *labels):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[i] += 1
+            series[-1] += value
+
+    def render(self):
+        with self._lock:
+            series = sorted((labels, list(counts)) for labels, counts in self._series.items())
+        lines = self.header()
+        for labels, counts in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = _labels(self.label_names + ("le",), labels + (bound,))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            base = _labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{base} {_number(counts[-1])}")
+            lines.append(f"{self.name}_count{base} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "wordguess_request_seconds", "Request latency by endpoint", ("endpoint", "method", "status"),
+))
+WORDS_SERVED = REGISTRY.register(Counter(
+    "wordguess_words_served_total", "Words handed to games by source (pool or fallback)",
+    ("topic", "length", "source"),
+))
+LLM_SECONDS = REGISTRY.register(Histogram(
+    "wordguess_llm_request_seconds", "AI generation call latency by outcome", ("outcome",), LLM_BUCKETS,
+))
+LLM_WORDS = REGISTRY.register(Counter(
+    "wordguess_llm_words_total", "Words in AI replies by validation result", ("result",),
+))
+DB_COMMIT_SECONDS = REGISTRY.register(Histogram(
+    "wordguess_db_commit_seconds", "Time to flush and commit a database session",
+))
@@ -0,0 +1,156 @@
+"""
+Write-behind score ingestion for Words Guess Game
+Accepted scores are queued and bulk-inserted by a background flusher once the
+batch is big enough or old enough, instead of one SQLite transaction per game
+"""
+
+import atexit
+from collections import deque
+import json
+import logging
+import os
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class _Queued:
+    __slots__ = ("record", "attempts")
+
+    def __init__(self, record):
+        self.record = record
+        self.attempts = 0  # failed writes of this record on its own
+
+
+class ScoreIngestQueue:
+    """Queue of accepted score records flushed in bulk on size or time thresholds.
+
+    When a batch write fails, its records are retried one at a time so only
+    the ones that fail on their own count an attempt, and a record is
+    dead-lettered after max_attempts of those. Exceptions listed in transient
+    (e.g. "database is locked") never count: the records wait for the next flush.
+    """
+
+    def __init__(self, write, max_batch=200, max_delay=0.5, max_depth=10_000, max_attempts=5,
+                 transient=()):
+        self.write = write          # write(records) inserts a batch in one transaction
+        self.max_batch = max_batch
+        self.max_delay = max_delay  # seconds a record may wait before it is flushed
+        self.max_depth = max_depth  # queued records before put() refuses more
+        self.max_attempts = max_attempts  # failed writes of a record before it is dead-lettered
+        self.transient = transient  # exception types that are retried without counting
+        self._records = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        self.flushed = 0
+        self.failures = 0
+        self.rejected = 0           # records refused because the queue was full
+        self.dropped = 0            # records dead-lettered after max_attempts failed writes
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def start(self):
+        """Start the flusher thread and flush whatever is queued at interpreter exit"""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="score-flusher", daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def _after_fork(self):
+        """A forked worker starts with no flusher and without the parent's queued records"""
+        self._records = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def put(self, record):
+        """Queue a record; False if max_depth records are already waiting, so the
+        caller writes it directly and slows down with the database"""
+        with self._cond:
+            if len(self._records) >= self.max_depth:
+                self.rejected += 1
+                return False
+            self._records.append(_Queued(record))
+            if len(self._records) >= self.max_batch:
+                self._cond.notify()
+        return True
+
+    def depth(self):
+        """Records accepted but not yet written"""
+        return len(self._records)
+
+    def pending(self, predicate):
+        """Queued records matching a predicate, newest first"""
+        with self._cond:
+            return [q.record for q in reversed(self._records) if predicate(q.record)]
+
+    def flush(self):
+        """Write everything queued so far; returns the number of records written"""
+        with self._flush_lock:
+            with self._cond:
+                batch = list(self._records)
+            if not batch:
+                return 0
+            try:
+                self.write([q.record for q in batch])
+            except self.transient:
+                self.failures += 1
+                log.warning("Score flush failed, %d records kept for retry", len(batch), exc_info=True)
+                return 0
+            except Exception:
+                self.failures += 1
+                log.exception("Score flush failed, retrying %d records one at a time", len(batch))
+                kept = self._write_each(batch)
+            else:
+                kept = []
+            written = len(batch) - len(kept) - sum(q.attempts >= self.max_attempts for q in batch)
+            self.flushed += written
+            with self._cond:
+                for _ in batch:
+                    self._records.popleft()
+                self._records.extendleft(reversed(kept))
+            return written
+
+    def _write_each(self, batch):
+        """Write records one by one after a failed batch; returns the ones to keep queued.
+        A record that fails on its own counts an attempt and is dead-lettered at max_attempts."""
+        kept = []
+        for i, queued in enumerate(batch):
+            try:
+                self.write([queued.record])
+            except self.transient:
+                return kept + batch[i:]
+            except Exception:
+                queued.attempts += 1
+                if queued.attempts < self.max_attempts:
+                    kept.append(queued)
+                    continue
+                # Dead letter: the record goes to the error log instead of being retried forever
+                log.exception("Score record failed %d times, dropping it: %s",
+                              queued.attempts, json.dumps(queued.record, default=str))
+                self.dropped += 1
+        return kept
+
+    def stop(self):
+        """Stop the flusher after a final flush (graceful shutdown)"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.max_delay
+                while not self._stopping and len(self._records) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopping:
+                    return
+            self.flush()
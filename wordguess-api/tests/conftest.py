@@ -0,0 +1,32 @@
+"""
+Shared fixtures: the API modules on sys.path, and an app on a throwaway
+database with the AI API switched off so words come from the word bank
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, API_DIR)
+
+TMP = tempfile.mkdtemp(prefix="wordguess-tests-")
+os.environ.update({
+    "IBM_API_KEY": "",
+    "WORDGUESS_DB_PATH": os.path.join(TMP, "wordguess.db"),
+    "GAME_STORE": "memory",
+    "LOG_LEVEL": "WARNING",
+})
+
+
+@pytest.fixture(scope="session")
+def app():
+    import app as wordguess
+    return wordguess.create_app({"TESTING": True})
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
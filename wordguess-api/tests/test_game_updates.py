@@ -0,0 +1,59 @@
+import threading
+
+import app as wordguess
+from game_state import MAX_HINTS, GameState
+from leaderboard import compute_score
+from game_store import SQLiteGameStore
+
+
+def test_concurrent_guesses_are_not_lost(client, monkeypatch, tmp_path):
+    store = SQLiteGameStore(str(tmp_path / "games.db"), encode=GameState.dumps, decode=GameState.loads)
+    monkeypatch.setattr(wordguess, "GAMES", store)
+    store.put("g1", GameState("QUIZZICAL", level=7))
+    accepted = []
+
+    def play(letter):
+        response = client.application.test_client().post("/api/guess", json={"game_id": "g1", "letter": letter})
+        if response.status_code == 200:
+            accepted.append(letter)
+
+    threads = [threading.Thread(target=play, args=(letter,)) for letter in "ABCDEFGHIJKLMNOPRSTUVWXY"]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(store.get("g1").guessed) == sorted(accepted)
+
+
+def test_hint_keeps_the_submitted_flag(client):
+    game = client.post("/api/new-game", json={"topic": "animals", "level": 2}).get_json()
+    store = client.application.extensions["game_store"]
+    store.update(game["game_id"], lambda g: setattr(g, "submitted", True))
+    assert client.post("/api/hint", json={"game_id": game["game_id"]}).status_code == 200
+    assert store.get(game["game_id"]).submitted
+
+
+def test_next_level_replaces_the_round(client):
+    game = client.post("/api/new-game", json={"topic": "food", "level": 1}).get_json()
+    client.post("/api/guess", json={"game_id": game["game_id"], "letter": "E"})
+    state = client.post("/api/next-level", json={"game_id": game["game_id"]}).get_json()
+    assert (state["level"], state["topic"], state["guessed"], state["lives"]) == (2, "food", [], 6)
+    assert client.post("/api/next-level", json={"game_id": "missing"}).status_code == 404
+
+
+def test_hints_are_limited_and_cost_points(client):
+    store = client.application.extensions["game_store"]
+    store.put("h1", GameState("ELEPHANT", level=6))
+    for _ in range(MAX_HINTS):
+        assert client.post("/api/hint", json={"game_id": "h1"}).status_code == 200
+    response = client.post("/api/hint", json={"game_id": "h1"})
+    assert (response.status_code, response.get_json()["error"]) == (400, "no_hints_left")
+    for letter in "ELPHANT":
+        client.post("/api/guess", json={"game_id": "h1", "letter": letter})
+
+    stats = store.get("h1").stats()
+    assert stats["won"] and stats["hints"] == MAX_HINTS
+    row = client.post("/api/score", json={"game_id": "h1", "player": "hinter"}).get_json()
+    inputs = [stats[k] for k in ("won", "word_length", "mistakes", "duration_ms", "accuracy", "level")]
+    assert row["score"] == compute_score(*inputs, hints=MAX_HINTS) < compute_score(*inputs)
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from leaderboard_cache import TopScores
+
+
+def row(score):
+    return {"score": score, "created_at": "2026-01-01T00:00:00", "id": score}
+
+
+def test_one_reader_reseeds_a_stale_board_while_others_serve_the_cache():
+    board = TopScores(refresh_interval=0.05)
+    board.seed([row(1)])
+    time.sleep(0.06)
+    loads = []
+
+    def load():
+        loads.append(1)
+        time.sleep(0.1)
+        return [row(1), row(2)]
+
+    threads = [threading.Thread(target=board.refresh, args=(load,)) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(loads) == 1
+    assert not board.stale()
+
+
+def test_a_new_board_is_seeded_on_first_read(client):
+    response = client.get("/api/leaderboard?window=daily&topic=space")
+    assert response.status_code == 200
+    assert isinstance(response.get_json(), list)
+
+
+def test_workers_starting_together_set_up_a_new_schema_once(tmp_path):
+    from flask import Flask
+    from sqlalchemy import event
+
+    import leaderboard
+
+    fresh = Flask(__name__)
+    fresh.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'fresh.db'}"
+    leaderboard.db.init_app(fresh)
+    with fresh.app_context():
+        event.listen(leaderboard.db.engine, "connect", leaderboard._set_sqlite_pragmas)
+    barrier = threading.Barrier(8)
+    results, errors = [], []
+
+    def worker():
+        with fresh.app_context():
+            barrier.wait()
+            try:
+                results.append(leaderboard.setup_schema())
+            except Exception as exc:
+                errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert results.count(True) == 1
+    with fresh.app_context():
+        assert leaderboard.schema_current()
+        leaderboard.db.engine.dispose()
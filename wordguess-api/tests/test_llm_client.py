@@ -0,0 +1,164 @@
+"""LLMClient against a local stub of the text generation API"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+import pytest
+
+from llm_client import CircuitBreaker, LLMClient, LLMError, LLMUnavailable
+
+
+def sse(text):
+    return "id: 1\nevent: message\ndata: " + json.dumps({"results": [{"generated_text": text}]})
+
+
+class Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    script = []  # status per request; the last one repeats
+    requests = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        cls = type(self)
+        status = cls.script[min(cls.requests, len(cls.script) - 1)]
+        cls.requests += 1
+        if status == "bad-gzip":  # requests raises ContentDecodingError
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", "9")
+            self.end_headers()
+            self.wfile.write(b"not gzip!")
+            return
+        if status in ("stream", "stream-cut"):
+            events = [sse("CA"), ": keep-alive", "data: {not json", sse("T, D"), sse("OG")]
+            body = "".join(line + "\n\n" for line in events).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            if status == "stream-cut":  # the connection drops after the first event and a long comment
+                sent = (events[0] + "\n\n: " + "x" * 600 + "\n\n").encode()
+                self.send_header("Content-Length", str(len(sent) + len(body)))
+                self.end_headers()
+                self.wfile.write(sent)
+                self.wfile.flush()
+                self.close_connection = True
+                return
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        body = json.dumps({"results": [{"generated_text": "CAT, DOG"}]} if status == 200 else {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def stub():
+    Stub.script, Stub.requests = [200], 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/ml/v1/text/generation?version=test"
+    server.shutdown()
+    server.server_close()
+
+
+def client(url, failures=3, reset=60.0):
+    return LLMClient(api_key="test", api_url=url, retries=2, backoff=0,
+                     breaker=CircuitBreaker(failure_threshold=failures, reset_timeout=reset))
+
+
+def test_retries_transient_statuses(stub):
+    Stub.script = [503, 503, 200]
+    assert client(stub).generate("prompt", 10) == "CAT, DOG"
+    assert Stub.requests == 3
+
+
+def test_does_not_retry_client_errors(stub):
+    Stub.script = [400]
+    with pytest.raises(LLMError):
+        client(stub).generate("prompt", 10)
+    assert Stub.requests == 1
+
+
+def test_breaker_opens_and_fails_fast(stub):
+    Stub.script = [500]
+    llm = client(stub, failures=2)
+    for _ in range(2):
+        with pytest.raises(LLMError):
+            llm.generate("prompt", 10)
+    requests = Stub.requests
+    with pytest.raises(LLMUnavailable):
+        llm.generate("prompt", 10)
+    assert Stub.requests == requests
+    assert llm.breaker.state == "open"
+
+
+def test_failed_trial_of_any_request_error_reopens_the_breaker(stub):
+    Stub.script = [500]
+    llm = client(stub, failures=1, reset=0.05)
+    with pytest.raises(LLMError):
+        llm.generate("prompt", 10)
+    time.sleep(0.06)
+
+    # The half-open trial fails with a request error that is not a connection error or timeout
+    Stub.script, Stub.requests = ["bad-gzip"], 0
+    with pytest.raises(LLMError):
+        llm.generate("prompt", 10)
+    assert llm.breaker.state == "open"
+
+    # After the next cooldown another trial is let through, and success closes the breaker
+    time.sleep(0.06)
+    Stub.script, Stub.requests = [200], 0
+    assert llm.generate("prompt", 10) == "CAT, DOG"
+    assert llm.breaker.state == "closed"
+
+
+def test_slot_timeout_does_not_use_up_the_half_open_trial(stub):
+    Stub.script = [500]
+    llm = LLMClient(api_key="test", api_url=stub, retries=0, max_concurrency=1, acquire_timeout=0.01,
+                    breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05))
+    with pytest.raises(LLMError):
+        llm.generate("prompt", 10)
+    time.sleep(0.06)
+
+    llm._slots.acquire()  # another call holds the only slot
+    with pytest.raises(LLMUnavailable, match="in flight"):
+        llm.generate("prompt", 10)
+    llm._slots.release()
+
+    Stub.script = [200]
+    assert llm.generate("prompt", 10) == "CAT, DOG"
+    assert llm.breaker.state == "closed"
+
+
+def test_stream_yields_text_from_server_sent_events(stub):
+    Stub.script = ["stream"]
+    llm = client(stub)
+    assert "".join(llm.generate_stream("prompt", 10)) == "CAT, DOG"
+    assert llm.breaker.state == "closed"
+    assert llm._slots.acquire(blocking=False)  # the slot came back when the stream ended
+
+
+def test_stream_cut_mid_way_raises_and_counts_against_the_breaker(stub):
+    Stub.script = ["stream-cut"]
+    llm = client(stub, failures=1)
+    chunks = []
+    with pytest.raises(LLMError, match="stream failed"):
+        for chunk in llm.generate_stream("prompt", 10):
+            chunks.append(chunk)
+    assert chunks == ["CA"]
+    assert llm.breaker.state == "open"
+    assert llm._slots.acquire(blocking=False)
+
+
+def test_stream_retries_before_the_first_event(stub):
+    Stub.script = [503, "stream"]
+    assert "".join(client(stub).generate_stream("prompt", 10)) == "CAT, DOG"
+    assert Stub.requests == 2
@@ -0,0 +1,20 @@
+def series(client, name):
+    body = client.get("/api/metrics").get_data(as_text=True)
+    return {line.split(" ")[0] for line in body.splitlines() if line.startswith(name)}
+
+
+def test_words_served_labels_are_bounded_by_the_word_bank(client):
+    before = series(client, "wordguess_words_served_total")
+    for i in range(50):
+        client.post("/api/new-game", json={"topic": f"made-up-{i}", "level": 1})
+    assert client.post("/api/new-game", json={"topic": ["not", "a", "topic"], "level": 1}).status_code == 200
+    added = series(client, "wordguess_words_served_total") - before
+    assert not any("made-up" in s for s in added)
+    assert len(added) <= 2  # animals/3 pool and fallback at most
+
+
+def test_ai_calls_per_1000_games_is_exported(client):
+    client.post("/api/new-game", json={"topic": "animals", "level": 1})
+    assert series(client, "wordguess_llm_calls_per_1000_games")
+    assert series(client, "wordguess_llm_calls ")
+    assert set(client.get("/api/health").get_json()["llm"]) == {"calls", "calls_per_1000_games", "breaker"}
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from leaderboard import PlayerStats, SCORE_QUEUE, db, write_scores
+
+START = datetime(2026, 1, 1)
+
+# Batches of results (1 = win) written one after another for one player
+BATCHES = [
+    [1, 1],           # new row
+    [1, 1, 0, 1],     # extends the stored streak, then a loss resets it
+    [1, 1],           # all wins: stored streak of 1 grows to 3
+    [0],              # a loss-only batch
+    [1, 1, 1, 1, 0],  # the best run is inside the batch
+    [1, 0, 1, 1, 1],  # leading win joins the stored streak of 0
+    [1, 1, 1],        # all wins on top of a trailing run of 3
+]
+
+
+def records(player, results, offset):
+    return [{
+        "player": player, "won": bool(won), "word": "CAT", "word_length": 3, "mistakes": 1 - won,
+        "correct": 3, "accuracy": 50.0 + 10 * won, "duration_ms": 1000, "score": 100 + i + offset,
+        "created_at": START + timedelta(minutes=offset + i), "topic": "animals", "level": 1,
+    } for i, won in enumerate(results)]
+
+
+def expected(results):
+    current = best = 0
+    for won in results:
+        current = current + 1 if won else 0
+        best = max(best, current)
+    return {"games": len(results), "wins": sum(results), "current_streak": current, "best_streak": best}
+
+
+def stats(player):
+    row = db.session.get(PlayerStats, player).to_dict()
+    return {k: row[k] for k in ("games", "wins", "current_streak", "best_streak")}
+
+
+@pytest.fixture
+def ctx(app):
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+def test_batches_merge_streaks_into_the_stored_row(ctx):
+    history = []
+    for batch in BATCHES:
+        write_scores(ctx, records("streaky", batch, len(history)))
+        history += batch
+        assert stats("streaky") == expected(history), (batch, history)
+
+
+def test_backfill_matches_incremental_updates(ctx):
+    players = {"alpha": BATCHES, "beta": [[0, 0], [1], [1, 1, 1, 1, 1, 1], [0, 1, 1]]}
+    for player, batches in players.items():
+        played = 0
+        for batch in batches:
+            write_scores(ctx, records(player, batch, played))
+            played += len(batch)
+    SCORE_QUEUE.flush()
+    db.session.expire_all()
+    incremental = {row.player: row.to_dict() for row in PlayerStats.query.all()}
+
+    result = ctx.test_cli_runner().invoke(args=["leaderboard", "backfill-stats"])
+    assert result.exit_code == 0, result.output
+    db.session.expire_all()
+    rebuilt = {row.player: row.to_dict() for row in PlayerStats.query.all()}
+    assert rebuilt == incremental
+    for player, batches in players.items():
+        assert stats(player) == expected([won for batch in batches for won in batch])
@@ -0,0 +1,64 @@
+from score_ingest import ScoreIngestQueue
+
+
+class Locked(Exception):
+    pass
+
+
+def poisoned_writer(written):
+    def write(records):
+        if any(r["n"] == "bad" for r in records):
+            raise ValueError("bad record")
+        written.extend(records)
+    return write
+
+
+def test_put_refuses_records_past_max_depth():
+    queue = ScoreIngestQueue(lambda records: None, max_depth=2)
+    assert queue.put({"n": 1}) and queue.put({"n": 2})
+    assert not queue.put({"n": 3})
+    assert (queue.depth(), queue.rejected) == (2, 1)
+
+
+def test_only_the_failing_record_is_dead_lettered():
+    written = []
+    queue = ScoreIngestQueue(poisoned_writer(written), max_attempts=3)
+    for n in (1, "bad", 2):
+        queue.put({"n": n})
+    assert queue.flush() == 2  # the batch fails, then the good records go in one at a time
+    assert written == [{"n": 1}, {"n": 2}]
+    assert [queue.flush() for _ in range(2)] == [0, 0]
+    assert (queue.depth(), queue.dropped, queue.flushed) == (0, 1, 2)
+
+
+def test_records_queued_late_get_their_own_attempts():
+    written = []
+    queue = ScoreIngestQueue(poisoned_writer(written), max_attempts=3)
+    queue.put({"n": "bad"})
+    queue.flush()
+    queue.flush()
+    queue.put({"n": 1})  # joins just before the poison record's last attempt
+    queue.put({"n": "bad"})
+    queue.flush()
+    assert queue.dropped == 1
+    assert written == [{"n": 1}]
+    assert queue.pending(lambda r: True) == [{"n": "bad"}]
+
+
+def test_transient_errors_never_drop_records():
+    written = []
+    locked = [True]
+
+    def write(records):
+        if locked[0]:
+            raise Locked("database is locked")
+        written.extend(records)
+
+    queue = ScoreIngestQueue(write, max_attempts=2, transient=(Locked,))
+    queue.put({"n": 1})
+    queue.put({"n": 2})
+    assert [queue.flush() for _ in range(10)] == [0] * 10
+    assert (queue.depth(), queue.dropped) == (2, 0)
+    locked[0] = False
+    assert queue.flush() == 2
+    assert written == [{"n": 1}, {"n": 2}]
@@ -0,0 +1,48 @@
+import json
+
+from word_bank import WordBank
+from word_batch import BatchWordParser, build_batch_prompt
+
+BUCKETS = [("animals", 3), ("animals", 4), ("food", 5)]
+REPLY = 'Sure! {"animals": {"3": ["CAT", "dog"], "4": ["BEAR"]}, "food": {"5": ["PIZZA"]}} Enjoy.'
+
+
+def parse(chunks, buckets=BUCKETS):
+    parser = BatchWordParser(buckets)
+    found = [triple for chunk in chunks for triple in parser.feed(chunk)]
+    return found, parser.rejected
+
+
+def test_words_are_found_in_any_chunking():
+    whole, _ = parse([REPLY])
+    assert whole == [("animals", 3, "CAT"), ("animals", 3, "DOG"), ("animals", 4, "BEAR"), ("food", 5, "PIZZA")]
+    assert parse(list(REPLY))[0] == whole
+    assert parse([REPLY[:17], REPLY[17:30], REPLY[30:]])[0] == whole
+
+
+def test_escapes_are_decoded():
+    found, rejected = parse(['{"animals": {"3": ["C\\u0041T", "D\\"G", "O\\\\L"]}}'])
+    assert found == [("animals", 3, "CAT")]
+    assert rejected == 2
+
+
+def test_wrong_nesting_is_ignored():
+    found, rejected = parse([
+        '{"animals": ["CAT"], "food": {"5": [["PIZZA"]]}, "3": {"animals": ["DOG"]}}',
+    ])
+    assert found == []
+    assert rejected == 1  # "DOG" sits under length "animals"
+
+
+def test_unknown_buckets_and_wrong_lengths_are_rejected():
+    found, rejected = parse(['{"plants": {"4": ["TREE"]}, "animals": {"3": ["HORSE", "C4T", "CAT", "CAT"]}}'])
+    assert found == [("animals", 3, "CAT")]
+    assert rejected == 3
+
+
+def test_prompt_lists_bank_examples_per_bucket():
+    bank = WordBank.load()
+    prompt = build_batch_prompt(BUCKETS, 5, bank.examples)
+    for topic, length in BUCKETS:
+        assert f"{topic} {length} letters (e.g. {bank.examples(topic, length)})" in prompt
+    assert json.dumps({"animals": {"3": ["WORD", "..."]}}) in prompt
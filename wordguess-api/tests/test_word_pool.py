@@ -0,0 +1,69 @@
+import app as wordguess
+from difficulty import score_words
+from word_bank import get_word_bank
+from word_pool import WordPool
+
+
+def test_served_words_are_skipped_unless_fallback():
+    pool = WordPool(capacity=5)
+    pool.extend("animals", 3, ["CAT"])
+    assert pool.pop("animals", 3) == "CAT"
+    assert pool.extend("animals", 3, ["CAT"]) == []
+    assert pool.extend("animals", 3, ["CAT"], skip_served=False) == ["CAT"]
+
+
+def test_fallback_refills_keep_the_pool_stocked(app):
+    # The bank has 14 three-letter animals, well under the served window
+    for _ in range(40):
+        added = wordguess.pregenerate_batch([("animals", 3)])[("animals", 3)]
+        assert added
+        while wordguess.WORD_POOL.pop("animals", 3):
+            pass
+
+
+def test_unknown_topics_share_the_default_bucket(client):
+    before = set(wordguess.WORD_POOL.stats()["buckets"])
+    for i in range(50):
+        assert client.post("/api/new-game", json={"topic": f"made-up-{i}", "level": 1}).status_code == 200
+    after = set(wordguess.WORD_POOL.stats()["buckets"])
+    assert not any(key.startswith("made-up") for key in after - before)
+
+
+def test_word_length_matches_the_word_past_the_longest_bucket(client):
+    game = client.post("/api/new-game", json={"topic": "animals", "level": 9}).get_json()
+    assert game["word_length"] == len(game["masked"].split()) == 8
+    state = client.post("/api/next-level", json={"game_id": game["game_id"]}).get_json()
+    assert state["word_length"] == len(state["masked"].split())
+
+
+def test_fallback_words_are_not_pooled_under_another_length(app):
+    assert wordguess.pregenerate_batch([("animals", 12)])[("animals", 12)] == []
+    assert wordguess.WORD_POOL.size("animals", 12) == 0
+
+
+def test_pool_words_follow_the_level_difficulty(client):
+    # Easy, middling and hard four-letter words; a pool bucket this size used to be one band
+    pooled = ["NEAT", "TEAR", "RAIN", "SEAL", "MIST", "LOUD", "FERN", "MOLD", "JINX", "WAXY", "FUZZ", "QUIZ"]
+    low, high = get_word_bank().score_bounds("animals", 4, wordguess.target_difficulty(2))
+    in_band = {word for word, score in zip(pooled, score_words(pooled)) if low <= score <= high}
+    assert 0 < len(in_band) < len(pooled)
+    served = []
+    for _ in range(20):
+        while wordguess.WORD_POOL.pop("animals", 4):
+            pass
+        wordguess.WORD_POOL.extend("animals", 4, pooled, skip_served=False)
+        for _ in range(3):
+            game = client.post("/api/new-game", json={"topic": "animals", "level": 2}).get_json()
+            served.append(client.application.extensions["game_store"].get(game["game_id"]).word)
+    scores = score_words(served)
+    assert all(low - 1e-9 <= score <= high + 1e-9 for score in scores), list(zip(served, scores))
+    assert set(served) & in_band  # served from the pool, not only the bank's fallback
+
+
+def test_pool_draws_only_inside_the_score_range():
+    pool = WordPool(capacity=20)
+    pool.extend("animals", 4, ["NEAT", "TEAR", "JINX", "QUIZ"])
+    easy = score_words(["TEAR"])[0]
+    assert pool.pop("animals", 4, (0.0, easy)) in {"NEAT", "TEAR"}
+    assert pool.pop("animals", 4, (0.9, 1.0)) is None  # nothing that hard: the oldest is evicted
+    assert pool.size("animals", 4) == 2 and pool.evictions == 1
@@ -0,0 +1,24 @@
+import threading
+
+from word_refill import WordRefiller
+
+
+def test_concurrent_requests_for_a_bucket_share_one_fill():
+    release = threading.Event()
+    calls = []
+
+    def fill(keys, count):
+        calls.append(keys)
+        release.wait(5)
+
+    refiller = WordRefiller(fill, lambda topic, length: 0, workers=1)
+    threads = [threading.Thread(target=refiller.ensure, args=("animals", 3)) for _ in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    release.set()
+    refiller._queue.join()
+
+    assert calls == [[("animals", 3)]]
+    assert refiller.stats() == {"fills": 1, "coalesced": 49, "pending": 0}
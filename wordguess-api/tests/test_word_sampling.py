@@ -0,0 +1,31 @@
+from collections import Counter
+
+from difficulty import DifficultyIndex
+from word_bank import WordBank
+
+
+def test_band_draws_without_replacement():
+    bank = WordBank.load()
+    low, high = bank._difficulty.band_bounds(bank.resolve("animals", 3), 0.2)
+    draws = Counter(bank.sample("animals", 3, 0.2) for _ in range((high - low) * 20))
+    # Every word in the band is served exactly once per pass
+    assert len(draws) == high - low
+    assert set(draws.values()) == {20}
+
+
+def test_band_covers_a_share_of_the_bucket():
+    index = DifficultyIndex.build({("t", 3): ["CAT", "DOG", "BAT", "RAT", "COW", "PIG", "FOX",
+                                             "BEE", "ANT", "OWL", "ELK", "EMU", "YAK", "HEN"]})
+    low, high = index.band_bounds(("t", 3), 0.0)
+    assert high - low >= 5
+    assert index.band_bounds(("t", 3), 1.0)[1] == 14
+
+
+def test_word_variety_per_level(client):
+    for level in range(1, 7):
+        words = Counter()
+        for _ in range(60):
+            game = client.post("/api/new-game", json={"topic": "animals", "level": level}).get_json()
+            words[client.application.extensions["game_store"].get(game["game_id"]).word] += 1
+        assert len(words) >= 5, (level, words)
+        assert max(words.values()) <= 20, (level, words)
@@ -0,0 +1,137 @@
+"""
+Word bank for Words Guess Game
+Fallback words loaded once from words.json on first use, validated, frozen
+into tuples indexed by (topic, length), and ranked by difficulty
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+
+log = logging.getLogger(__name__)
+
+WORDS_PATH = os.path.join(os.path.dirname(__file__), "words.json")
+DEFAULT_TOPIC = "animals"
+EXAMPLE_COUNT = 10
+
+
+class WordSampler:
+    """Random draws without replacement from a word tuple, O(1) per draw.
+
+    A lazy Fisher-Yates shuffle: only swapped slots are remembered, and the
+    sampler starts a fresh pass once every word has been drawn.
+    """
+
+    __slots__ = ("words", "remaining", "swaps")
+
+    def __init__(self, words):
+        self.words = words
+        self.remaining = len(words)
+        self.swaps = {}
+
+    def draw(self):
+        if self.remaining == 0:
+            self.remaining = len(self.words)
+            self.swaps = {}
+        i = random.randrange(self.remaining)
+        last = self.remaining - 1
+        picked = self.swaps.get(i, i)
+        self.swaps[i] = self.swaps.pop(last, last)
+        self.remaining = last
+        return self.words[picked]
+
+
+class WordBank:
+    """Immutable (topic, length) -> words index"""
+
+    def __init__(self, data):
+        buckets = {}
+        rejected = []
+        for topic, by_length in data.items():
+            for length, words in by_length.items():
+                length = int(length)
+                valid = []
+                for word in words:
+                    word = word.strip().upper()
+                    if len(word) != length or not word.isalpha() or not word.isascii():
+                        rejected.append(word)
+                    elif word not in valid:
+                        valid.append(word)
+                if valid:
+                    buckets[(topic.lower(), length)] = tuple(valid)
+        if rejected:
+            log.warning("Word bank skipped %d invalid words: %s", len(rejected), rejected)
+
+        self._buckets = buckets
+        self.topics = tuple(dict.fromkeys(topic for topic, _ in buckets))
+        self._lengths = {
+            topic: tuple(sorted(n for t, n in buckets if t == topic)) for topic in self.topics
+        }
+        self._examples = {key: ", ".join(words[:EXAMPLE_COUNT]) for key, words in buckets.items()}
+        self._samplers = {key: WordSampler(words) for key, words in buckets.items()}
+        self._lock = threading.Lock()
+
+        from difficulty import DifficultyIndex  # numpy loads with the bank, not at import
+        self._difficulty = DifficultyIndex.build(buckets)
+        self._band_samplers = {}  # (key, low, high) -> sampler over that slice of the ranked words
+
+    @classmethod
+    def load(cls, path=WORDS_PATH):
+        """Build a word bank from a JSON file of {topic: {length: [words]}}"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def resolve(self, topic, length):
+        """Bucket key for a request. Unknown topics use the default topic, and
+        lengths outside the bank use the nearest length it has."""
+        if not isinstance(topic, str) or topic not in self._lengths:
+            topic = DEFAULT_TOPIC
+        lengths = self._lengths[topic]
+        if (topic, length) not in self._buckets:
+            length = min(lengths, key=lambda n: (abs(n - length), -n))
+        return topic, length
+
+    def words(self, topic, length):
+        """Frozen tuple of words for a topic and length"""
+        return self._buckets[self.resolve(topic, length)]
+
+    def examples(self, topic, length):
+        """Comma-separated examples for AI prompts"""
+        return self._examples[self.resolve(topic, length)]
+
+    def sample(self, topic, length, difficulty=None):
+        """Random word; repeats only after the whole bucket has been served.
+        With a target difficulty (0 = easiest, 1 = hardest in the bucket) the word
+        comes from the band around it, again without repeats until the band is used up."""
+        key = self.resolve(topic, length)
+        if difficulty is None:
+            sampler = self._samplers[key]
+        else:
+            low, high = self._difficulty.band_bounds(key, difficulty)
+            sampler = self._band_samplers.get((key, low, high))
+            if sampler is None:
+                sampler = WordSampler(self._difficulty.words(key)[low:high])
+                sampler = self._band_samplers.setdefault((key, low, high), sampler)
+        with self._lock:
+            return sampler.draw()
+
+    def score_bounds(self, topic, length, difficulty):
+        """(lowest, highest) difficulty score of the band sample() draws from for a target,
+        so words from elsewhere (the pool) can be matched against the bank's distribution"""
+        return self._difficulty.score_bounds(self.resolve(topic, length), difficulty)
+
+
+_WORD_BANK = None
+_WORD_BANK_LOCK = threading.Lock()
+
+
+def get_word_bank():
+    """The shared word bank, loaded on first use"""
+    global _WORD_BANK
+    if _WORD_BANK is None:
+        with _WORD_BANK_LOCK:
+            if _WORD_BANK is None:
+                _WORD_BANK = WordBank.load()
+    return _WORD_BANK
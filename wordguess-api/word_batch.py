@@ -0,0 +1,123 @@
+"""
+Batch word generation for Words Guess Game
+One prompt asks for words across several (topic, length) buckets as JSON,
+and the reply is parsed incrementally so words can be pooled as they stream in
+"""
+
+import json
+
+MAX_BATCH_TOKENS = 1024
+
+
+def group_buckets(buckets):
+    """{topic: [lengths]} in a stable order"""
+    grouped = {}
+    for topic, length in buckets:
+        grouped.setdefault(topic, [])
+        if length not in grouped[topic]:
+            grouped[topic].append(length)
+    return grouped
+
+
+def build_batch_prompt(buckets, count, examples=None):
+    """Prompt asking for `count` words per bucket, answered as nested JSON.
+    examples(topic, length), e.g. WordBank.examples, adds sample words for each bucket."""
+    grouped = group_buckets(buckets)
+    if examples is None:
+        wanted = "; ".join(
+            f"{topic} ({', '.join(str(n) for n in lengths)} letters)" for topic, lengths in grouped.items()
+        )
+    else:
+        wanted = "; ".join(
+            f"{topic} {n} letters (e.g. {examples(topic, n)})" for topic, lengths in grouped.items() for n in lengths
+        )
+    topic, lengths = next(iter(grouped.items()))
+    shape = json.dumps({topic: {str(lengths[0]): ["WORD", "..."]}})
+    return (
+        f"Generate {count} different common English words for each topic and word length below. "
+        f"Every word must have exactly that many letters, A-Z only. {wanted}. "
+        f"Return only JSON shaped like {shape}, keyed by topic and then by length."
+    )
+
+
+def batch_token_budget(buckets, count):
+    """max_new_tokens sized to the words requested plus JSON punctuation"""
+    grouped = group_buckets(buckets)
+    tokens = 4
+    for topic, lengths in grouped.items():
+        tokens += 6 + len(topic) // 3
+        for length in lengths:
+            tokens += 4 + count * (length // 3 + 3)
+    return min(tokens, MAX_BATCH_TOKENS)
+
+
+class BatchWordParser:
+    """Incremental parser for {"topic": {"length": ["WORD", ...]}} replies.
+
+    feed() accepts arbitrary text chunks and returns the (topic, length, word)
+    triples completed so far. Text outside the JSON object, unknown buckets and
+    words of the wrong length are ignored.
+    """
+
+    def __init__(self, buckets):
+        self.wanted = set(buckets)
+        self._stack = []        # frames: [container, key in parent, last key seen]
+        self._in_string = False
+        self._escape = False
+        self._buf = []
+        self._seen = set()
+        self.rejected = 0
+
+    def feed(self, chunk):
+        found = []
+        for ch in chunk:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._string("".join(self._buf), found)
+                    continue
+                self._buf.append(ch)
+            elif ch == '"':
+                if self._stack:
+                    self._in_string = True
+                    self._buf = []
+            elif ch in "{[":
+                parent_key = self._stack[-1][2] if self._stack else None
+                self._stack.append([ch, parent_key, None])
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+        return found
+
+    def _string(self, raw, found):
+        try:
+            value = json.loads(f'"{raw}"')  # decodes escapes such as \u0041
+        except ValueError:
+            value = None
+        frame = self._stack[-1]
+        if frame[0] == "{":
+            frame[2] = value
+            return
+        if len(self._stack) != 3:
+            return
+        if value is None:
+            self.rejected += 1
+            return
+        topic, length = self._stack[1][1], self._stack[2][1]
+        word = value.strip().upper()
+        try:
+            key = (topic, int(length))
+        except (TypeError, ValueError):
+            self.rejected += 1
+            return
+        if key not in self.wanted or len(word) != key[1] or not word.isalpha() or not word.isascii():
+            self.rejected += 1
+            return
+        if (key, word) in self._seen:
+            return
+        self._seen.add((key, word))
+        found.append((key[0], key[1], word))
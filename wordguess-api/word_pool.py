@@ -0,0 +1,122 @@
+"""
+Word pool for Words Guess Game
+Bounded, thread-safe buckets of ready-to-serve words keyed by (topic, length).
+Words are scored for difficulty as they enter, so a game can ask for one in a
+score range (the word bank's band for its level) instead of the oldest.
+"""
+
+from collections import deque
+import threading
+
+
+class _Bucket:
+    __slots__ = ("words", "queued", "recent", "served")
+
+    def __init__(self, recent_size):
+        self.words = deque()                    # ready words, served FIFO
+        self.queued = set()                     # mirror of words for O(1) dedup
+        self.recent = deque(maxlen=recent_size) # recently served words, oldest first
+        self.served = set()                     # mirror of recent for O(1) dedup
+
+
+class WordPool:
+    """Deque-backed word buckets with a per-bucket capacity and hit/miss/refill counters"""
+
+    def __init__(self, capacity=20, recent_size=50):
+        self.capacity = capacity
+        self.recent_size = recent_size
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.duplicates = 0
+        self.evictions = 0
+        self._difficulty = None  # DifficultyIndex over ready words, created with the first words
+
+    def _index(self):
+        if self._difficulty is None:
+            from difficulty import DifficultyIndex  # numpy loads with the first pooled words
+            self._difficulty = DifficultyIndex()
+        return self._difficulty
+
+    def _bucket(self, key):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self.recent_size)
+        return bucket
+
+    def pop(self, topic, length, scores=None):
+        """Take a ready word from a bucket, or None on a miss: the oldest, or with a
+        (low, high) score range a random word scored inside it. When no ready word is
+        in range the oldest one is evicted, so a bucket stocked with words no level
+        asks for drains and gets refilled instead of sitting full."""
+        key = (topic, length)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if not bucket or not bucket.words:
+                self.misses += 1
+                return None
+            if scores is None:
+                word = bucket.words.popleft()
+                self._difficulty.discard(key, word)
+            else:
+                word = self._difficulty.take_between(key, *scores)
+                if word is None:
+                    stale = bucket.words.popleft()
+                    bucket.queued.discard(stale)
+                    self._difficulty.discard(key, stale)
+                    self.evictions += 1
+                    self.misses += 1
+                    return None
+                bucket.words.remove(word)
+            bucket.queued.discard(word)
+            if len(bucket.recent) == bucket.recent.maxlen:
+                bucket.served.discard(bucket.recent[0])
+            bucket.recent.append(word)
+            bucket.served.add(word)
+            self.hits += 1
+            return word
+
+    def extend(self, topic, length, words, skip_served=True):
+        """Add words to a bucket, skipping duplicates and recently served words.
+        Fallback words pass skip_served=False: a bank bucket is smaller than the
+        served window, so once all its words were served none would be added again.
+        Returns the words that were actually added."""
+        added = []
+        with self._lock:
+            bucket = self._bucket((topic, length))
+            for word in words:
+                if len(bucket.words) >= self.capacity:
+                    break
+                if word in bucket.queued or (skip_served and word in bucket.served):
+                    self.duplicates += 1
+                    continue
+                bucket.words.append(word)
+                bucket.queued.add(word)
+                added.append(word)
+            if added:
+                self.refills += 1
+                self._index().add((topic, length), added)
+        return added
+
+    def size(self, topic, length):
+        """Number of ready words in a bucket"""
+        bucket = self._buckets.get((topic, length))
+        return len(bucket.words) if bucket else 0
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(b.words) for b in self._buckets.values())
+
+    def stats(self):
+        """Counters and bucket sizes for monitoring"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "refills": self.refills,
+                "duplicates": self.duplicates,
+                "evictions": self.evictions,
+                "buckets": {f"{t}_{n}": len(b.words) for (t, n), b in self._buckets.items()},
+            }
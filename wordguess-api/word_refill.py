@@ -0,0 +1,106 @@
+"""
+Background word refiller for Words Guess Game
+Keeps each (topic, length) word bucket above a low-water mark so that
+request handlers only ever pop a ready word and never wait on the AI API.
+Refills are single-flight per bucket: a bucket already queued or being
+refilled is not queued again, however many requests find it low.
+"""
+
+import logging
+import os
+import queue
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class WordRefiller:
+    """Tops up word buckets ahead of demand on daemon worker threads"""
+
+    def __init__(self, fill, level, low_water=2, batch_size=5, max_batch=8, workers=2):
+        self.fill = fill            # fill([(topic, length), ...], count) generates and stores words
+        self.level = level          # level(topic, length) returns the current bucket size
+        self.low_water = low_water
+        self.batch_size = batch_size
+        self.max_batch = max_batch  # buckets refilled together in one fill call
+        self.workers = workers
+
+        self._queue = queue.Queue()
+        self._pending = set()       # keys queued or being refilled right now
+        self._lock = threading.Lock()
+        self._threads = []
+        self.coalesced = 0          # refill requests folded into one already pending
+        self.fills = 0              # fill calls made
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        """Threads do not survive a fork: a forked worker starts its own on first use"""
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._run, name=f"word-refill-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def ensure(self, topic, length):
+        """Schedule a refill if the bucket has dropped below the low-water mark"""
+        if self.level(topic, length) < self.low_water:
+            return self.schedule(topic, length)
+        return False
+
+    def schedule(self, topic, length, start=True):
+        """Queue a refill for a bucket unless one is already pending"""
+        key = (topic, length)
+        with self._lock:
+            if key in self._pending:
+                self.coalesced += 1
+                return False
+            self._pending.add(key)
+        self._queue.put(key)
+        if start:
+            self.start()
+        return True
+
+    def warm_up(self, topics, lengths):
+        """Queue a refill for every topic/length combination, then start workers
+        so the first fill calls can batch several buckets together"""
+        for topic in topics:
+            for length in lengths:
+                if self.level(topic, length) < self.low_water:
+                    self.schedule(topic, length, start=False)
+        self.start()
+
+    def pending(self):
+        """Number of buckets waiting for or undergoing a refill"""
+        with self._lock:
+            return len(self._pending)
+
+    def stats(self):
+        return {"fills": self.fills, "coalesced": self.coalesced, "pending": self.pending()}
+
+    def _run(self):
+        while True:
+            keys = [self._queue.get()]
+            while len(keys) < self.max_batch:
+                try:
+                    keys.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.fills += 1
+            try:
+                self.fill(keys, self.batch_size)
+            except Exception:
+                log.exception("Word refill failed for %s", keys)
+            finally:
+                with self._lock:
+                    self._pending.difference_update(keys)
+                for _ in keys:
+                    self._queue.task_done()
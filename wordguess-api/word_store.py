@@ -0,0 +1,113 @@
+"""
+Persistent AI word cache for Words Guess Game
+Validated AI words are kept in wordguess.db so restarts and new workers start
+warm, and well-stocked buckets are refilled from disk instead of the AI API
+"""
+
+from collections import Counter
+from datetime import datetime, timezone
+import threading
+
+from sqlalchemy import func, update
+from sqlalchemy.dialects.sqlite import insert
+
+from leaderboard import db
+
+
+class CachedWord(db.Model):
+    """An AI-generated word and how often it has been served"""
+    __tablename__ = 'ai_words'
+    __table_args__ = (
+        db.UniqueConstraint('topic', 'length', 'word', name='uq_ai_words_bucket_word'),
+        db.Index('ix_ai_words_bucket_served', 'topic', 'length', 'serve_count'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    topic = db.Column(db.String(32), nullable=False)
+    length = db.Column(db.Integer, nullable=False)
+    word = db.Column(db.String(64), nullable=False)
+    serve_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class WordStore:
+    """Bulk-appending, lazily loaded word store on the leaderboard database"""
+
+    def __init__(self, app=None, reuse_min=30):
+        self.app = app
+        self.reuse_min = reuse_min  # stored words needed before a bucket stops calling the AI
+        self._sizes = {}            # (topic, length) -> stored word count, per loaded bucket
+        self._serves = Counter()    # (topic, length, word) -> serves not yet written
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Bind to the app whose database holds the words"""
+        self.app = app
+
+    def record_served(self, topic, length, word):
+        """Count a serve in memory; written out with the next store operation"""
+        with self._lock:
+            self._serves[(topic, length, word)] += 1
+
+    def _flush_serves(self):
+        with self._lock:
+            serves, self._serves = self._serves, Counter()
+        if not serves:
+            return
+        table = CachedWord.__table__
+        db.session.execute(
+            update(table)
+            .where(table.c.topic == db.bindparam('b_topic'))
+            .where(table.c.length == db.bindparam('b_length'))
+            .where(table.c.word == db.bindparam('b_word'))
+            .values(serve_count=table.c.serve_count + db.bindparam('b_count')),
+            [{'b_topic': t, 'b_length': n, 'b_word': w, 'b_count': c} for (t, n, w), c in serves.items()],
+        )
+
+    def append(self, words_by_bucket):
+        """Persist {(topic, length): [words]} in one bulk insert, ignoring duplicates"""
+        rows = [
+            {'topic': topic, 'length': length, 'word': word, 'serve_count': 0}
+            for (topic, length), words in words_by_bucket.items()
+            for word in words
+        ]
+        if not rows:
+            return
+        with self.app.app_context():
+            db.session.execute(insert(CachedWord.__table__).on_conflict_do_nothing(), rows)
+            self._flush_serves()
+            db.session.commit()
+        with self._lock:
+            for (topic, length), words in words_by_bucket.items():
+                if (topic, length) in self._sizes:
+                    self._sizes[(topic, length)] += len(words)
+
+    def reuse(self, topic, length, count):
+        """Stored words for a bucket, least served first.
+
+        The first call for a bucket in this process loads whatever is stored so
+        the pool starts warm; after that, words are only reused once the bucket
+        holds at least reuse_min words, otherwise [] and the caller asks the AI.
+        """
+        key = (topic, length)
+        with self.app.app_context():
+            self._flush_serves()
+            with self._lock:
+                first = key not in self._sizes
+            if first:
+                size = db.session.query(func.count(CachedWord.id)).filter_by(topic=topic, length=length).scalar()
+                with self._lock:
+                    self._sizes[key] = size
+            else:
+                size = self._sizes[key]
+            if not size or (not first and size < self.reuse_min):
+                db.session.commit()
+                return []
+            words = [
+                w for (w,) in db.session.query(CachedWord.word)
+                .filter_by(topic=topic, length=length)
+                .order_by(CachedWord.serve_count, func.random())
+                .limit(count)
+            ]
+            db.session.commit()
+            return words
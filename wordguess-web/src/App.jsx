@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import StartScreen from "./components/StartScreen";
 import TopicSelection from "./components/TopicSelection";
 import Leaderboard from "./components/Leaderboard";
@@ -27,6 +27,9 @@ export default function App() {
   const [loading, setLoading] = useState(false);
   const [showLeaderboard, setShowLeaderboard] = useState(false);
   const [hintsRemaining, setHintsRemaining] = useState(3);
+  // Letters typed while a guess request is in flight are sent together in one batch
+  const pendingLetters = useRef([]);
+  const guessInFlight = useRef(false);
 
   console.log("App rendered:", { 
     playerName, 
@@ -79,33 +82,45 @@ export default function App() {
       return;
     }
 
+    pendingLetters.current.push(letter);
+    if (guessInFlight.current) {
+      console.log("🎹 Guess queued for the next batch:", letter);
+      return;
+    }
+
+    guessInFlight.current = true;
     try {
-      console.log("🎹 Making API call for guess:", letter);
-      const response = await fetch(`${API_BASE}/api/guess`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          game_id: gameData.game_id,
-          letter: letter
-        })
-      });
+      while (pendingLetters.current.length > 0) {
+        const letters = pendingLetters.current.splice(0);
+        console.log("🎹 Making API call for guesses:", letters);
+        const response = await fetch(`${API_BASE}/api/guess/batch`, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({
+            game_id: gameData.game_id,
+            letters: letters
+          })
+        });
 
-      if (!response.ok) throw new Error('Failed to make guess');
+        if (!response.ok) throw new Error('Failed to make guess');
 
-      const data = await response.json();
-      console.log("🎹 Guess result:", data);
-      console.log("🎹 Word length after guess:", data.word_length);
-      console.log("🎹 Actual word length:", data.word?.length);
-      setGameData(data);
-      setGuessedLetters(data.guessed || []);
-      setGameStatus(data.status || "playing");
+        const data = await response.json();
+        console.log("🎹 Guess result:", data);
+        setGameData(prev => ({ ...prev, ...data }));
+        setGuessedLetters(data.guessed || []);
+        setGameStatus(data.status || "playing");
 
-      if (data.status === "won" || data.status === "lost") {
-        // Game over - submit score
-        await submitScore(data);
+        if (data.status === "won" || data.status === "lost") {
+          // Game over - submit score, drop anything typed after the last letter
+          pendingLetters.current = [];
+          await submitScore({ ...gameData, ...data });
+        }
       }
     } catch (error) {
+      pendingLetters.current = [];
       console.error("🎹 Error making guess:", error);
+    } finally {
+      guessInFlight.current = false;
     }
   };
 
@@ -254,7 +269,8 @@ export default function App() {
         correct: gameResult.guessed?.length || 0,
         accuracy: gameResult.guessed?.length ? (gameResult.guessed.filter(l => gameResult.answer?.includes(l)).length / gameResult.guessed.length) * 100 : 0,
         duration_ms: Date.now() - (gameData?.startTime || Date.now()),
-        level: currentLevel
+        level: currentLevel,
+        topic: currentTopic
       };
       
       const response = await fetch(`${API_BASE}/api/score`, {